@@ -1,25 +1,89 @@
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+import json
 import os
+import re
 
 _BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
 _ENV_FILE = os.path.join(_BACKEND_DIR, ".env")
 
-class Settings(BaseSettings):
+@dataclass(frozen=True)
+class Settings:
     MONGODB_URL: str = "mongodb://localhost:27017"
     DB_NAME: str = "voxassist"
+    # Motor connection pool tuning
+    MONGO_MAX_POOL_SIZE: int = 200
+    MONGO_MIN_POOL_SIZE: int = 10
+    MONGO_MAX_IDLE_TIME_MS: int = 300_000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5000
     FIREBASE_CREDENTIALS_PATH: str = "service-account-key.json"
     SECRET_KEY: str = "default_secret"
-    CORS_ORIGINS: list[str] = [
+    CORS_ORIGINS: list[str] = field(default_factory=lambda: [
         "http://localhost:5173",
         "http://localhost:4173",
-    ]
+    ])
     FRONTEND_URL: str = "http://localhost:5173"
     MAX_PROMPT_LENGTH: int = 5000
 
-    model_config = SettingsConfigDict(
-        env_file=_ENV_FILE,
-        extra="ignore"
-    )
 
+def _parse_env_value(value: str) -> str:
+    """
+    Value part of a .env line: quoted values run to the closing quote,
+    unquoted values end at an inline ` # comment`.
+    """
+    value = value.strip()
+    if value[:1] in ("'", '"'):
+        end = value.find(value[0], 1)
+        if end != -1:
+            return value[1:end]
+    return re.split(r"\s#", value, maxsplit=1)[0].rstrip()
 
-settings = Settings()
\ No newline at end of file
+
+@lru_cache(maxsize=1)
+def _load_env() -> dict:
+    """
+    Read backend/.env once and overlay the process environment on top
+    (real environment variables win, as with pydantic-settings).
+    Keys are upper-cased, so names match fields case-insensitively.
+    """
+    env = {}
+    if os.path.exists(_ENV_FILE):
+        with open(_ENV_FILE, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("export "):
+                    line = line[len("export "):].lstrip()
+                if not line or line.startswith("#") or "=" not in line:
+                    continue
+                key, value = line.split("=", 1)
+                env[key.strip().upper()] = _parse_env_value(value)
+    env.update((key.upper(), value) for key, value in os.environ.items())
+    return env
+
+
+def _coerce(raw: str, annotation):
+    """Convert a raw env string to the field's declared type."""
+    if annotation is int:
+        return int(raw)
+    if getattr(annotation, "__origin__", None) is list:
+        return json.loads(raw)
+    return raw
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build Settings once per process; .env is parsed on the first call only."""
+    env = _load_env()
+    overrides = {}
+    for f in fields(Settings):
+        raw = env.get(f.name.upper())
+        if raw is None:
+            continue
+        try:
+            overrides[f.name] = _coerce(raw, f.type)
+        except ValueError as e:
+            raise ValueError(f"Invalid value for setting {f.name}: {raw!r} ({e})") from e
+    return Settings(**overrides)
+
+
+settings = get_settings()
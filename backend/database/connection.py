@@ -1,9 +1,11 @@
 from motor.motor_asyncio import AsyncIOMotorClient
-from config import settings
+from pymongo.errors import PyMongoError
+from config import get_settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
 MONGO_URL = settings.MONGODB_URL
 DB_NAME = settings.DB_NAME
 
@@ -17,13 +19,20 @@ import asyncio
 async def connect_to_mongo():
     for attempt in range(3):
         try:
-            db.client = AsyncIOMotorClient(MONGO_URL, serverSelectionTimeoutMS=5000)
+            db.client = AsyncIOMotorClient(
+                MONGO_URL,
+                maxPoolSize=settings.MONGO_MAX_POOL_SIZE,
+                minPoolSize=settings.MONGO_MIN_POOL_SIZE,
+                maxIdleTimeMS=settings.MONGO_MAX_IDLE_TIME_MS,
+                serverSelectionTimeoutMS=settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+                retryWrites=True,
+            )
             db.db = db.client[DB_NAME]
             print(f"Connected to MongoDB at {MONGO_URL}")
             # Ping db to verify connection
             await db.client.admin.command('ping')
             return
-        except Exception as e:
+        except PyMongoError as e:
             print(f"WARNING: MongoDB connection failed on attempt {attempt+1}: {e}")
             if attempt < 2:
                 await asyncio.sleep(2)
@@ -31,24 +40,38 @@ async def connect_to_mongo():
                 print("ERROR: MongoDB connection failed after retries.")
                 # We won't raise so the app doesn't crash, but DB ops will fail later
 
+async def _create_index(collection, keys, **kwargs):
+    """Create a single index, logging (not raising) on failure."""
+    try:
+        await collection.create_index(keys, **kwargs)
+        return True
+    except PyMongoError as e:
+        # OperationFailure (conflicting/invalid index) or the server being
+        # unreachable; either way startup carries on without this index
+        logger.error(f"Failed to create index {keys} on '{collection.name}': {e}")
+        print(f"WARNING: Database index creation failed for '{collection.name}' {keys}: {e}")
+        return False
+
 async def create_database_indexes():
     """
     Perform index creation in the background to avoid blocking the main server startup.
+    All index builds are issued concurrently instead of one round-trip at a time.
     """
     if db.db is None:
         return
 
     # Create Indexes
-    try:
-        await db.db.designs.create_index([("user_id", 1)])
-        await db.db.designs.create_index([("created_at", -1)])
-        await db.db.users.create_index([("email", 1)], unique=True)
-        await db.db.jobs.create_index([("user_id", 1)])
-        await db.db.jobs.create_index([("created_at", -1)])
+    # Per-user listings filter on user_id and sort on created_at, so a compound
+    # index lets MongoDB walk it in order instead of sorting in memory.
+    # designs keeps a created_at index for the public /designs feed.
+    results = await asyncio.gather(
+        _create_index(db.db.designs, [("user_id", 1), ("created_at", -1)], background=True),
+        _create_index(db.db.designs, [("created_at", -1)], background=True),
+        _create_index(db.db.users, [("email", 1)], unique=True),
+        _create_index(db.db.jobs, [("user_id", 1), ("created_at", -1)], background=True),
+    )
+    if all(results):
         print("Database indexes created/verified successfully")
-    except Exception as e:
-        logger.error(f"Failed to create database indexes: {e}")
-        print(f"WARNING: Database index creation failed: {e}")
 
 async def close_mongo_connection():
     if db.client:
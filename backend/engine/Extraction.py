@@ -1,26 +1,197 @@
+import argparse
+import os
 import pickle
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
 import pandas as pd
-from shapely.wkt import dumps
+import shapely
+from shapely.geometry.base import BaseGeometry
+
+# pyarrow is optional: its C++ CSV writer is much faster than pandas' to_csv
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# pyarrow errors meaning "this batch can't be typed/written by Arrow"
+_ARROW_ERRORS = (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) if pa is not None else ()
 
 file_path = 'ResPlan.pkl'
+output_filename = 'ResPlan_extracted.csv'
+# Set to e.g. 'ResPlan_extracted.parquet' to also write a Parquet copy (needs pyarrow)
+parquet_filename = None
+# Plans converted per batch; bounds the size of the intermediate DataFrame
+CHUNK_ROWS = 5000
 
-try:
-    with open(file_path, 'rb') as f:
-        data = pickle.load(f)
 
-    # Convert the list of dictionaries into a DataFrame
-    df = pd.DataFrame(data)
+def _is_geometry_column(col):
+    """True if the first non-null value of the column is a Shapely geometry."""
+    first = col.first_valid_index()
+    return first is not None and isinstance(col[first], BaseGeometry)
+
+
+def _column_to_wkt(col):
+    """
+    Vectorized WKT conversion of a geometry column, at full precision as
+    with `.wkt`. Missing cells stay empty; any other non-geometry cell is
+    written as str(value).
+    """
+    values = col.to_numpy(dtype=object)
+    is_geom = shapely.is_geometry(values)
+    out = np.full(len(values), None, dtype=object)
+    out[is_geom] = shapely.to_wkt(values[is_geom], rounding_precision=-1)
+    other = ~is_geom & ~pd.isna(values)
+    out[other] = [str(v) for v in values[other]]
+    return out
+
+
+def _to_wkt_frame(rows, columns):
+    """Build a DataFrame for a batch of plans with geometry columns as WKT."""
+    df = pd.DataFrame(rows, columns=columns)
+    return pd.DataFrame({
+        c: _column_to_wkt(df[c]) if _is_geometry_column(df[c]) else df[c]
+        for c in columns
+    })
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and value != value)
+
+
+def _parquet_schema(data, columns):
+    """
+    Arrow schema for the Parquet copy, fixed up front from the column set:
+    geometry columns are WKT strings, other columns take the type of their
+    first non-missing value across all plans, and always-empty columns
+    are strings.
+    """
+    fields = []
+    for c in columns:
+        value = next((row[c] for row in data if not _is_missing(row.get(c))), None)
+        if value is None or isinstance(value, BaseGeometry):
+            arrow_type = pa.string()
+        else:
+            try:
+                arrow_type = pa.array([value]).type
+            except _ARROW_ERRORS:
+                arrow_type = pa.string()
+        fields.append(pa.field(c, arrow_type))
+    return pa.schema(fields)
+
+
+def _write_chunk(df_str, out, header, parquet_writer=None):
+    """
+    Append one WKT batch to the open CSV (and Parquet) output.
+
+    The batch is written to each output exactly once. A batch that can't
+    go to Parquet raises RuntimeError instead of being skipped.
+    """
+    if pa is not None:
+        try:
+            table = pa.Table.from_pandas(df_str, preserve_index=False)
+        except _ARROW_ERRORS as e:
+            # Columns holding arbitrary Python objects can't be typed by Arrow
+            if parquet_writer is not None:
+                raise RuntimeError(f"batch cannot be converted for Parquet: {e}") from e
+            table = None
+            print(f"pyarrow writer unavailable for this batch ({e}), falling back to pandas")
+
+        if parquet_writer is not None:
+            try:
+                parquet_writer.write_table(table.cast(parquet_writer.schema))
+            except _ARROW_ERRORS as e:
+                raise RuntimeError(f"batch does not match the Parquet schema: {e}") from e
+
+        if table is not None:
+            # Rendered in memory first, so a failure can't leave half a batch in the CSV
+            buf = pa.BufferOutputStream()
+            try:
+                pacsv.write_csv(table, buf, write_options=pacsv.WriteOptions(include_header=header))
+            except _ARROW_ERRORS as e:
+                print(f"pyarrow CSV writer unavailable for this batch ({e}), falling back to pandas")
+            else:
+                out.write(buf.getvalue().to_pybytes())
+                return
+    df_str.to_csv(out, header=header, index=False)
+
+
+def _map_bounded(pool, fn, items, window, *args):
+    """
+    Ordered pool.map that keeps at most `window` tasks in flight, so
+    finished batches can't pile up faster than they are written out.
+    """
+    items = iter(items)
+    pending = deque(pool.submit(fn, item, *args) for item in islice(items, window))
+    while pending:
+        fut = pending.popleft()
+        for item in islice(items, 1):
+            pending.append(pool.submit(fn, item, *args))
+        yield fut.result()
+
+
+def extract(file_path, output_filename, parquet_filename=None,
+            chunk_rows=CHUNK_ROWS, workers=None):
+    """
+    Convert the pickled plans to CSV (and optionally Parquet).
+
+    Plans are independent, so batches are converted to WKT in a process
+    pool; the parent only writes the finished batches, in order. At most
+    two batches per worker are in flight at a time.
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            data = pickle.load(f)
+    except (FileNotFoundError, pickle.UnpicklingError) as e:
+        print(f"Error: could not load '{file_path}': {e}")
+        return 1
+
+    # The pickle is a list of dictionaries. Instead of converting it into one
+    # big DataFrame (and then a full WKT copy of it), convert and write it in
+    # batches so only a few batches of strings exist in memory at a time.
+    # Column order matches pd.DataFrame(data): keys in first-seen order.
+    columns = list(dict.fromkeys(k for row in data for k in row))
+    batches = (data[start:start + chunk_rows] for start in range(0, len(data), chunk_rows))
+    workers = workers or os.cpu_count()
+
+    parquet_writer = None
+    try:
+        with open(output_filename, 'wb') as out, \
+                ProcessPoolExecutor(max_workers=workers) as pool:
+            # The geometric objects cannot be saved to CSV directly.
+            # We must convert them to string format (WKT) first.
+            if parquet_filename and pa is not None:
+                parquet_writer = pq.ParquetWriter(parquet_filename, _parquet_schema(data, columns))
+            for i, df_str in enumerate(_map_bounded(pool, _to_wkt_frame, batches, 2 * workers, columns)):
+                _write_chunk(df_str, out, header=(i == 0), parquet_writer=parquet_writer)
+    except OSError as e:
+        print(f"Error: could not write '{output_filename}': {e}")
+        return 1
+    except RuntimeError as e:
+        print(f"Error: could not write '{parquet_filename}': {e}")
+        return 1
+    finally:
+        if parquet_writer is not None:
+            parquet_writer.close()
+
+    if parquet_filename and pa is None:
+        print("pyarrow is not installed, skipping Parquet output")
+
+    print(f"Success! Extracted {len(data)} floor plans to '{output_filename}'")
+    return 0
 
-    # The geometric objects cannot be saved to CSV directly.
-    # We must convert them to string format (WKT) first.
-    # We apply this to every cell in the dataframe.
-    df_str = df.applymap(lambda x: x.wkt if hasattr(x, 'wkt') else str(x))
 
-    # Save to CSV
-    output_filename = 'ResPlan_extracted.csv'
-    df_str.to_csv(output_filename, index=False)
-    
-    print(f"Success! Extracted {len(df)} floor plans to '{output_filename}'")
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Extract ResPlan floor plans to CSV with WKT geometry")
+    parser.add_argument('input', nargs='?', default=file_path, help="pickled list of plans")
+    parser.add_argument('-o', '--output', default=output_filename, help="CSV output path")
+    parser.add_argument('--parquet', default=parquet_filename, help="also write a Parquet copy (needs pyarrow)")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help="plans converted per batch")
+    parser.add_argument('-j', '--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args()
 
-except Exception as e:
-    print(f"Error: {e}")
\ No newline at end of file
+    raise SystemExit(extract(args.input, args.output, args.parquet, args.chunk_rows, args.workers))
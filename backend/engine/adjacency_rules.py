@@ -14,6 +14,8 @@ ZONES:
 - Service: Bathrooms, Storage, Utility
 """
 
+from functools import lru_cache
+
 ADJACENCY_RULES = {
     "living": {
         "anchor": True,  # Core room - placed first
@@ -214,30 +216,68 @@ DEFAULT_ROOM_RULES = {
     "avoid": {}
 }
 
+# Flattened (room_type, other_type) lookup tables, built once at import so
+# validate_adjacency is a couple of hash probes instead of nested .get() chains
+AVOID_SET = frozenset(
+    (room_type, other)
+    for room_type, rules in ADJACENCY_RULES.items()
+    for other, avoided in rules.get("avoid", {}).items()
+    if avoided
+)
+PREFER_SET = frozenset(
+    (room_type, other)
+    for room_type, rules in ADJACENCY_RULES.items()
+    for other in rules.get("prefer", {})
+)
+_DEFAULT_PREFER = frozenset(DEFAULT_ROOM_RULES["prefer"])
+
+# Flat per-room-type attribute tables (one dict probe instead of
+# ADJACENCY_RULES[room_type]["aspect_ratio"])
+ASPECT_RATIO = {k: v["aspect_ratio"] for k, v in ADJACENCY_RULES.items()}
+IS_ANCHOR = {k: v["anchor"] for k, v in ADJACENCY_RULES.items()}
+IS_EXTERNAL = {k: v["external"] for k, v in ADJACENCY_RULES.items()}
+
+
+def get_aspect_ratio(room_type):
+    """Preferred aspect ratio for a room type (fallback rules if unknown)"""
+    return ASPECT_RATIO.get(room_type, DEFAULT_ROOM_RULES["aspect_ratio"])
+
+
+def is_anchor(room_type):
+    """Whether a room type is a layout anchor (placed first)"""
+    return IS_ANCHOR.get(room_type, DEFAULT_ROOM_RULES["anchor"])
+
+
+def is_external(room_type):
+    """Whether a room type sits outside the building boundary"""
+    return IS_EXTERNAL.get(room_type, DEFAULT_ROOM_RULES["external"])
+
+
+def _prefers(room_type, other):
+    """Whether room_type's rules (or the fallback rules) prefer touching other"""
+    if room_type in ADJACENCY_RULES:
+        return (room_type, other) in PREFER_SET
+    return other in _DEFAULT_PREFER
+
 
 # =========================
 # ARCHITECTURAL VALIDATION
 # =========================
+@lru_cache(maxsize=256)
 def validate_adjacency(room_type_1, room_type_2):
     """
     Check if two room types should be adjacent based on architectural principles.
     Returns (is_valid, reason)
     """
-    rules_1 = ADJACENCY_RULES.get(room_type_1, DEFAULT_ROOM_RULES)
-    rules_2 = ADJACENCY_RULES.get(room_type_2, DEFAULT_ROOM_RULES)
-    
     # Check if explicitly avoided
-    if rules_1.get("avoid", {}).get(room_type_2):
+    if (room_type_1, room_type_2) in AVOID_SET:
         return False, f"{room_type_1} should not touch {room_type_2}"
     
-    if rules_2.get("avoid", {}).get(room_type_1):
+    if (room_type_2, room_type_1) in AVOID_SET:
         return False, f"{room_type_2} should not touch {room_type_1}"
     
     # Check if preferred
-    if room_type_2 in rules_1.get("prefer", {}):
-        return True, "Preferred connection"
-    
-    if room_type_1 in rules_2.get("prefer", {}):
+    if _prefers(room_type_1, room_type_2) or _prefers(room_type_2, room_type_1):
         return True, "Preferred connection"
     
     # Neutral - not preferred but not avoided
@@ -256,12 +296,16 @@ ROOM_ZONES = {
     "outdoor": ["balcony", "garden", "terrace"],
 }
 
+# Reverse lookup: room type -> zone
+ROOM_TO_ZONE = {
+    room_type: zone
+    for zone, types in ROOM_ZONES.items()
+    for room_type in types
+}
+
 def get_room_zone(room_type):
     """Get the zone classification for a room type"""
-    for zone, types in ROOM_ZONES.items():
-        if room_type in types:
-            return zone
-    return "other"
+    return ROOM_TO_ZONE.get(room_type, "other")
 
 
 # =========================
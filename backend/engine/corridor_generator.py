@@ -1,4 +1,6 @@
-from shapely.geometry import LineString, Polygon, Point
+import numpy as np
+import shapely
+from shapely.geometry import Polygon
 from shapely.ops import unary_union
 
 # =========================
@@ -6,71 +8,78 @@ from shapely.ops import unary_union
 # =========================
 CORRIDOR_WIDTH = 1.5
 CLEARANCE = 0.2
+SHARED_WALL_TOL = 0.6  # Rooms sharing less wall than this need a corridor
 
 # =========================
 # HELPERS
 # =========================
-def _safe_centroid(poly):
-    """Safely get centroid of a polygon"""
-    if poly.is_empty:
-        return Point(0, 0)
-    return poly.centroid
+def _safe_centroids(geoms):
+    """(N, 2) centroid coordinates; empty polygons map to the origin"""
+    xy = np.zeros((len(geoms), 2))
+    non_empty = ~shapely.is_empty(geoms)
+    xy[non_empty] = shapely.get_coordinates(shapely.centroid(geoms[non_empty]))
+    return xy
 
 
-def _wall_midpoint_towards(src, dst):
+def _wall_midpoints_towards(src_bounds, src_centroids, dst_points):
     """
-    Pick midpoint of the wall of src polygon facing dst point
+    Pick midpoint of the wall of each src polygon facing its dst point.
+
+    Batched and branchless: src_bounds is (N, 4), src_centroids and
+    dst_points are (N, 2); returns the (N, 2) midpoint coordinates.
     """
-    minx, miny, maxx, maxy = src.bounds
-    cx, cy = src.centroid.coords[0]
-    dx, dy = dst.x - cx, dst.y - cy
+    minx, miny, maxx, maxy = src_bounds.T
+    dx, dy = (dst_points - src_centroids).T
 
-    if abs(dx) > abs(dy):
-        # Left or right wall
-        x = maxx if dx > 0 else minx
-        y = (miny + maxy) / 2
-    else:
-        # Top or bottom wall
-        y = maxy if dy > 0 else miny
-        x = (minx + maxx) / 2
+    # Left/right wall when the target is mostly horizontal, else top/bottom
+    horizontal = np.abs(dx) > np.abs(dy)
+    x = np.where(horizontal, np.where(dx > 0, maxx, minx), (minx + maxx) / 2)
+    y = np.where(horizontal, (miny + maxy) / 2, np.where(dy > 0, maxy, miny))
 
-    return Point(x, y)
+    return np.column_stack((x, y))
 
 
-def _manhattan_path(p1, p2):
+def _manhattan_corridor_polys(p1, p2):
     """
-    Create L-shaped corridor path between two points
+    Corridor rectangles for L-shaped paths between (N, 2) point arrays:
+    a horizontal leg along p1.y, then a vertical leg along p2.x.
+
+    The legs are axis-aligned, so they are emitted directly as boxes of
+    width CORRIDOR_WIDTH instead of buffering LineStrings. Legs shorter
+    than 1e-3 are dropped.
     """
-    lines = []
-    # Horizontal segment
-    if abs(p2.x - p1.x) > 1e-3:
-        lines.append(LineString([(p1.x, p1.y), (p2.x, p1.y)]))
-    # Vertical segment
-    if abs(p2.y - p1.y) > 1e-3:
-        lines.append(LineString([(p2.x, p1.y), (p2.x, p2.y)]))
-    return lines
+    w = CORRIDOR_WIDTH / 2
+    (x1, y1), (x2, y2) = p1.T, p2.T
 
+    horizontal = shapely.box(np.minimum(x1, x2) - w, y1 - w, np.maximum(x1, x2) + w, y1 + w)
+    vertical = shapely.box(x2 - w, np.minimum(y1, y2) - w, x2 + w, np.maximum(y1, y2) + w)
 
-def _buffer_lines(lines):
-    """
-    Convert line segments to corridor polygons with proper width
-    """
-    polys = []
-    for ln in lines:
-        if ln.length < 1e-3:
-            continue
-        polys.append(ln.buffer(CORRIDOR_WIDTH / 2, cap_style=2))
-    return polys
+    return np.concatenate((
+        horizontal[np.abs(x2 - x1) > 1e-3],
+        vertical[np.abs(y2 - y1) > 1e-3],
+    ))
 
 
-def _shared_wall_segment(poly_a, poly_b, tol=0.6):
+def _shared_wall_lengths(geoms, bounds, a, b):
     """
-    Returns the shared wall segment between two adjacent rooms
+    Length of the shared wall for every (geoms[a[i]], geoms[b[i]]) pair,
+    computed with vectorized shapely ops (one boundary per room, one
+    intersection call). Pairs whose bounding boxes don't touch are rejected
+    up front and never reach the boundary intersection.
     """
-    inter = poly_a.boundary.intersection(poly_b.boundary)
-    if inter.is_empty or inter.length < tol:
-        return None
-    return inter
+    ba, bb = bounds[a], bounds[b]
+    touching = (
+        (ba[:, 0] <= bb[:, 2]) & (bb[:, 0] <= ba[:, 2]) &
+        (ba[:, 1] <= bb[:, 3]) & (bb[:, 1] <= ba[:, 3])
+    )
+
+    lengths = np.zeros(len(a))
+    if touching.any():
+        boundaries = shapely.boundary(geoms)
+        lengths[touching] = shapely.length(
+            shapely.intersection(boundaries[a[touching]], boundaries[b[touching]])
+        )
+    return lengths
 
 
 # =========================
@@ -86,33 +95,33 @@ def generate_corridors(rooms, adjacency):
     
     Returns: Shapely geometry (Polygon, MultiPolygon, or None)
     """
-    corridors = []
-
-    for r1, r2 in adjacency:
-        if r1 not in rooms or r2 not in rooms:
-            continue
-
-        poly1 = rooms[r1]
-        poly2 = rooms[r2]
-
-        # Check if rooms share a wall (adjacent)
-        shared = _shared_wall_segment(poly1, poly2)
-        
-        if not shared:
-            # Rooms are not adjacent, create L-shaped corridor
-            c1 = _safe_centroid(poly1)
-            c2 = _safe_centroid(poly2)
-            
-            # Get wall points facing each other
-            wall_p1 = _wall_midpoint_towards(poly1, c2)
-            wall_p2 = _wall_midpoint_towards(poly2, c1)
-            
-            # Create manhattan path and buffer it
-            path_lines = _manhattan_path(wall_p1, wall_p2)
-            corridor_polys = _buffer_lines(path_lines)
-            corridors.extend(corridor_polys)
-
-    if not corridors:
+    pairs = [(r1, r2) for r1, r2 in adjacency if r1 in rooms and r2 in rooms]
+    if not pairs:
+        return None
+
+    # Per-room geometry is computed once, as arrays indexed by room position
+    names = list(rooms)
+    index = {name: i for i, name in enumerate(names)}
+    geoms = np.asarray([rooms[n] for n in names], dtype=object)
+    bounds = shapely.bounds(geoms)
+    a = np.fromiter((index[r1] for r1, _ in pairs), dtype=np.intp, count=len(pairs))
+    b = np.fromiter((index[r2] for _, r2 in pairs), dtype=np.intp, count=len(pairs))
+
+    # Rooms sharing a wall (adjacent) need no corridor
+    needed = _shared_wall_lengths(geoms, bounds, a, b) < SHARED_WALL_TOL
+    if not needed.any():
+        return None
+    a, b = a[needed], b[needed]
+
+    # Rooms are not adjacent: get wall points facing each other
+    centroids = _safe_centroids(geoms)
+    wall_p1 = _wall_midpoints_towards(bounds[a], centroids[a], centroids[b])
+    wall_p2 = _wall_midpoints_towards(bounds[b], centroids[b], centroids[a])
+
+    # Create L-shaped manhattan corridors
+    corridors = _manhattan_corridor_polys(wall_p1, wall_p2)
+
+    if not len(corridors):
         return None
 
     return unary_union(corridors)
\ No newline at end of file
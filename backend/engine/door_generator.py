@@ -13,8 +13,19 @@ def _extract_lines(geom):
         return list(geom.geoms)
     return []
 
-def _shared_wall(poly_a, poly_b):
-    inter = poly_a.boundary.intersection(poly_b.boundary)
+def _bounds_touch(bounds_a, bounds_b):
+    """Cheap bounding-box test: rooms whose boxes don't touch share no wall."""
+    ax0, ay0, ax1, ay1 = bounds_a
+    bx0, by0, bx1, by1 = bounds_b
+    return ax0 <= bx1 and bx0 <= ax1 and ay0 <= by1 and by0 <= ay1
+
+def _shared_wall(room_a, room_b):
+    """room_a / room_b are cached (bounds, boundary) tuples."""
+    bounds_a, boundary_a = room_a
+    bounds_b, boundary_b = room_b
+    if not _bounds_touch(bounds_a, bounds_b):
+        return None
+    inter = boundary_a.intersection(boundary_b)
     lines = _extract_lines(inter)
     lines = [l for l in lines if l.length > WALL_TOLERANCE]
     if not lines:
@@ -62,6 +73,30 @@ def _opening_from_wall(wall, width):
         (mid.x - nx*w + px*d, mid.y - ny*w + py*d),
     ])
 
+def generate_door_polygons(rooms, opening_specs):
+    """
+    Same openings as generate_doors, as a plain list of polygons (not
+    unioned), for callers that add more openings before one final union.
+    """
+    specs = [(r1, r2, width) for r1, r2, width in opening_specs if r1 in rooms and r2 in rooms]
+
+    # Bounds and boundary are computed once per room, not once per spec
+    names = {name for r1, r2, _ in specs for name in (r1, r2)}
+    cache = {name: (rooms[name].bounds, rooms[name].boundary) for name in names}
+
+    openings = []
+
+    for r1, r2, width in specs:
+        wall = _shared_wall(cache[r1], cache[r2])
+        if not wall:
+            continue
+
+        opening = _opening_from_wall(wall, width)
+        if opening:
+            openings.append(opening)
+
+    return openings
+
 def generate_doors(rooms, opening_specs):
     """
     PURE GEOMETRY ENGINE.
@@ -81,20 +116,7 @@ def generate_doors(rooms, opening_specs):
       - Unary union of all generated opening polygons.
       - Returns None if no valid openings produced.
     """
-    openings = []
-
-    for r1, r2, width in opening_specs:
-        if r1 not in rooms or r2 not in rooms:
-            continue
-
-        wall = _shared_wall(rooms[r1], rooms[r2])
-        if not wall:
-            continue
-
-        opening = _opening_from_wall(wall, width)
-        if opening:
-            openings.append(opening)
-
+    openings = generate_door_polygons(rooms, opening_specs)
     if not openings:
         return None
 
@@ -1,11 +1,15 @@
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.patches import Arc
-from shapely.geometry import Polygon, MultiPolygon, LineString
+from matplotlib.collections import LineCollection, PolyCollection
+import shapely
+from shapely.geometry import Polygon, MultiPolygon
 from shapely.ops import unary_union, linemerge
 import numpy as np
+from numba import njit
 import os
 import csv
+from functools import lru_cache
 
 # =========================
 # COLORS (MODERN ARCHITECTURAL PALETTE)
@@ -28,79 +32,190 @@ ROOM_COLORS = {
 WALL_COLOR = "#8B4513"      # Saddle Brown
 DOOR_COLOR = "#FFD700"      # Gold
 DOOR_ARC_COLOR = "#FFA500"  # Orange for arc
+DEFAULT_ROOM_COLOR = "#F5F5F5"
 
-def get_wall_segments(rooms):
-    """Extract all wall segments from rooms"""
-    segments = []
-    for poly in rooms.values():
-        coords = list(poly.exterior.coords)
-        for i in range(len(coords) - 1):
-            segments.append((coords[i], coords[i+1]))
-    return segments
+# Figure size in inches: the plan is scaled to fit FIGURE_MAX_SIZE, with a
+# TITLE_BAND strip reserved above it for the title
+FIGURE_MAX_SIZE = (16, 12)
+FIGURE_MIN_WIDTH = 4
+TITLE_BAND = 1.0
 
 
-def find_door_on_segment(seg_start, seg_end, all_doors):
-    """Check if any door is on this wall segment (robust projection)"""
-    wall_line = LineString([seg_start, seg_end])
-    
-    for door_poly in all_doors:
-        door_center = door_poly.centroid
-        
-        # Project door center onto wall line
-        proj_point = wall_line.project(door_center)
-        closest_point = wall_line.interpolate(proj_point)
-        
-        # Check if projection is within segment bounds (not extended line)
-        if proj_point <= 0 or proj_point >= wall_line.length:
-            continue
-            
-        # Check proximity to wall (tolerance for floating point / geometry error)
-        if door_center.distance(closest_point) < 0.6:  # increased tolerance
-            return door_center, door_poly
-    
-    return None, None
+@lru_cache(maxsize=512)
+def _room_meta(room_name):
+    """(label type, label number, fill color) for a room name like 'bedroom_2'"""
+    parts = room_name.split("_")
+    room_num = parts[1] if len(parts) > 1 else ""
+    return parts[0].upper(), room_num, ROOM_COLORS.get(parts[0], DEFAULT_ROOM_COLOR)
 
+def _room_exterior_coords(rooms):
+    """Exterior ring of every room as an (n, 2) array, read from GEOS once"""
+    return {name: np.asarray(poly.exterior.coords) for name, poly in rooms.items()}
 
-def draw_wall_with_door(ax, seg_start, seg_end, door_center, door_width=1.2, is_entrance=False):
-    """Draw wall segment with door opening and arc.
 
-    If is_entrance is True, use a distinct color to highlight the front door.
+def get_wall_segments(rooms, room_coords=None):
+    """Extract all wall segments from rooms as an (M, 2, 2) array
+
+    Each row is (start, end) of one exterior edge.
+    room_coords: optional precomputed _room_exterior_coords(rooms).
     """
-    wall_vec = np.array(seg_end) - np.array(seg_start)
-    wall_len = np.linalg.norm(wall_vec)
-    
+    if room_coords is None:
+        room_coords = _room_exterior_coords(rooms)
+    rings = [ring for ring in room_coords.values() if len(ring) > 1]
+    if not rings:
+        return np.empty((0, 2, 2))
+    return np.concatenate([np.stack([ring[:-1], ring[1:]], axis=1) for ring in rings])
+
+
+DOOR_WALL_TOL = 0.6  # Max distance from a door center to its wall
+DOOR_WIDTH = 1.2
+
+
+def _door_centers_xy(all_doors):
+    """(D, 2) array of door centroid coordinates"""
+    return np.array([(c.x, c.y) for c in (d.centroid for d in all_doors)]).reshape(-1, 2)
+
+
+@njit(cache=True)
+def _door_geometry(sx, sy, ex, ey, cx, cy, door_width):
+    """
+    Door opening on the wall (sx, sy)-(ex, ey) for a door centered near (cx, cy).
+
+    Returns (door_start_x, door_start_y, door_end_x, door_end_y,
+    panel_end_x, panel_end_y, angle_deg); all NaN for degenerate walls.
+    """
+    wx = ex - sx
+    wy = ey - sy
+    wall_len = np.sqrt(wx * wx + wy * wy)
+
     if wall_len < 0.01:
-        return
-    
-    wall_vec = wall_vec / wall_len
-    
-    # Project door onto wall
-    door_vec = np.array([door_center.x, door_center.y]) - np.array(seg_start)
-    t = np.dot(door_vec, wall_vec)
-    t = max(door_width/2, min(wall_len - door_width/2, t))
-    
-    door_pos = np.array(seg_start) + t * wall_vec
-    door_start = door_pos - (door_width / 2) * wall_vec
-    door_end = door_pos + (door_width / 2) * wall_vec
+        return np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan
+
+    ux = wx / wall_len
+    uy = wy / wall_len
+
+    # Project door onto wall, keeping the opening inside the segment
+    half = door_width / 2
+    t = (cx - sx) * ux + (cy - sy) * uy
+    t = max(half, min(wall_len - half, t))
+
+    px = sx + t * ux
+    py = sy + t * uy
+
+    # Door panel swings perpendicular to the wall, length of the arc radius
+    arc_radius = door_width * 0.9
+
+    return (px - half * ux, py - half * uy,
+            px + half * ux, py + half * uy,
+            px - half * ux - arc_radius * uy, py - half * uy + arc_radius * ux,
+            np.degrees(np.arctan2(uy, ux)))
+
+
+@njit(cache=True)
+def _door_geometry_batch(seg_starts, seg_ends, door_centers, door_width):
+    """_door_geometry for K door walls at once: (K, 2) inputs -> (K, 7)"""
+    out = np.empty((seg_starts.shape[0], 7))
+    for i in range(seg_starts.shape[0]):
+        out[i] = _door_geometry(seg_starts[i, 0], seg_starts[i, 1],
+                                seg_ends[i, 0], seg_ends[i, 1],
+                                door_centers[i, 0], door_centers[i, 1],
+                                door_width)
+    return out
+
+
+def match_doors_to_walls(segments, door_xy):
+    """
+    Door index for every wall segment (-1 where the wall has no door).
+
+    Door centers are projected onto each wall; a door belongs to a wall if
+    its projection falls strictly inside the segment and lies within
+    DOOR_WALL_TOL of it. Where several doors match, the first (in list
+    order) wins. Computed over the whole (M walls, D doors) grid at once:
+    segments is (M, 2, 2), door_xy is (D, 2).
+    """
+    door_idx = np.full(len(segments), -1)
+    if not len(segments) or not len(door_xy):
+        return door_idx
+
+    start = segments[:, 0, :]                      # (M, 2)
+    wall_vec = segments[:, 1, :] - start           # (M, 2)
+    len_sq = (wall_vec * wall_vec).sum(axis=1)     # (M,)
+    valid_wall = len_sq > 0
+
+    rel = door_xy[None, :, :] - start[:, None, :]  # (M, D, 2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = (rel * wall_vec[:, None, :]).sum(axis=-1) / len_sq[:, None]
+    dist_sq = ((rel - t[..., None] * wall_vec[:, None, :]) ** 2).sum(axis=-1)
+
+    hit = (t > 0) & (t < 1) & (dist_sq < DOOR_WALL_TOL ** 2) & valid_wall[:, None]
+    has_door = hit.any(axis=1)
+    # argmax picks the first matching door
+    door_idx[has_door] = np.argmax(hit[has_door], axis=1)
+    return door_idx
+
+
+@lru_cache(maxsize=2048)
+def _match_ring_doors(ring_key, door_key):
+    """Door index per wall of one room ring, memoized on the raw coordinates"""
+    ring = np.frombuffer(ring_key).reshape(-1, 2)
+    door_xy = np.frombuffer(door_key).reshape(-1, 2)
+    segments = np.stack([ring[:-1], ring[1:]], axis=1)
+    return tuple(match_doors_to_walls(segments, door_xy))
+
+
+def match_room_doors(room_coords, door_xy):
+    """
+    match_doors_to_walls for the walls of get_wall_segments(rooms, room_coords),
+    cached per room: re-drawing layouts that share rooms and doors (e.g.
+    candidates that differ in a single room) only re-matches the changed rooms.
+    """
+    door_key = np.ascontiguousarray(door_xy, dtype=float).tobytes()
+    door_idx = []
+    for ring in room_coords.values():
+        if len(ring) > 1:
+            ring_key = np.ascontiguousarray(ring, dtype=float).tobytes()
+            door_idx.extend(_match_ring_doors(ring_key, door_key))
+    return np.array(door_idx, dtype=int)
+
+
+def draw_wall_with_door(ax, seg_start, seg_end, door_center, door_width=DOOR_WIDTH, is_entrance=False,
+                        geometry=None):
+    """Draw door arc and panel on a wall segment.
+
+    The wall halves and the door opening are returned as
+    (wall_segs, gap_seg) coordinates instead of being plotted, so the caller
+    can draw all walls in a single LineCollection. Returns ([], None) for
+    degenerate walls.
+
+    geometry: optional precomputed _door_geometry(...) row for this wall.
+
+    If is_entrance is True, use a distinct color to highlight the front door.
+    """
+    if geometry is None:
+        geometry = _door_geometry(seg_start[0], seg_start[1], seg_end[0], seg_end[1],
+                                  door_center.x, door_center.y, door_width)
+    dsx, dsy, dex, dey, pex, pey, angle_deg = geometry
+
+    if np.isnan(dsx):
+        return [], None
     
-    # Wall before door
-    ax.plot([seg_start[0], door_start[0]], [seg_start[1], door_start[1]], 
-           color=WALL_COLOR, linewidth=12, solid_capstyle='butt', zorder=3)
+    door_start = (dsx, dsy)
+    door_end = (dex, dey)
     
-    # Wall after door
-    ax.plot([door_end[0], seg_end[0]], [door_end[1], seg_end[1]], 
-           color=WALL_COLOR, linewidth=12, solid_capstyle='butt', zorder=3)
+    # Wall before and after door
+    wall_segs = [
+        (tuple(seg_start), door_start),
+        (door_end, tuple(seg_end)),
+    ]
     
     # Choose colors (highlight entrance differently)
     door_color = "#FF0000" if is_entrance else DOOR_COLOR
     door_arc_color = "#FF4500" if is_entrance else DOOR_ARC_COLOR
 
     # Door opening (white gap)
-    ax.plot([door_start[0], door_end[0]], [door_start[1], door_end[1]],
-            color='white', linewidth=3, zorder=4)
+    gap_seg = (door_start, door_end)
 
     # Door arc (gold/orange or highlighted)
-    angle_deg = np.degrees(np.arctan2(wall_vec[1], wall_vec[0]))
     arc_radius = door_width * 0.9
 
     arc = Arc(door_start, arc_radius * 2, arc_radius * 2,
@@ -109,13 +224,11 @@ def draw_wall_with_door(ax, seg_start, seg_end, door_center, door_width=1.2, is_
     ax.add_patch(arc)
 
     # Door panel line (gold or highlighted)
-    perp = np.array([-wall_vec[1], wall_vec[0]])
-    door_line_end = door_start + arc_radius * (wall_vec * np.cos(np.pi/2) + perp * np.sin(np.pi/2))
-
-    ax.plot([door_start[0], door_line_end[0]],
-            [door_start[1], door_line_end[1]],
+    ax.plot([dsx, pex], [dsy, pey],
             color=door_color, linewidth=3, zorder=5)
 
+    return wall_segs, gap_seg
+
 
 def draw_2d_floorplan(layout, filename="floorplan_2d.png"):
     """Pure 2D floor plan from layout geometry"""
@@ -131,62 +244,100 @@ def draw_2d_floorplan(layout, filename="floorplan_2d.png"):
             all_doors = [doors_geom]
         elif isinstance(doors_geom, MultiPolygon):
             all_doors = list(doors_geom.geoms)
-    
+
+    door_xy = _door_centers_xy(all_doors)
+
+    # Get bounds (per-room (minx, miny, maxx, maxy); empty rooms are NaN)
+    bounds = shapely.bounds(np.asarray(list(rooms.values()), dtype=object))
+    minx, miny = np.nanmin(bounds[:, :2], axis=0)
+    maxx, maxy = np.nanmax(bounds[:, 2:], axis=0)
+    margin = 1  # metres; enough for the wall strokes and edge labels
+    plan_w = maxx - minx + 2 * margin
+    plan_h = maxy - miny + 2 * margin
+
     # Setup figure
-    fig, ax = plt.subplots(1, 1, figsize=(16, 12), facecolor='white')
-    ax.set_aspect('equal')
+    # Built without pyplot (no global figure manager, safe to run in worker
+    # threads). The figure takes the plan's aspect ratio (within
+    # FIGURE_MAX_SIZE) so the plan fills the canvas, plus a band on top
+    # for the title.
+    max_w, max_h = FIGURE_MAX_SIZE
+    scale = min(max_w / plan_w, (max_h - TITLE_BAND) / plan_h)
+    fig_w = max(plan_w * scale, FIGURE_MIN_WIDTH)
+    fig_h = plan_h * scale + TITLE_BAND
+    fig = Figure(figsize=(fig_w, fig_h), facecolor='white')
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot(1, 1, 1)
+    fig.subplots_adjust(left=0, right=1, top=1 - TITLE_BAND / fig_h, bottom=0)
+    ax.set_xlim(minx - margin, maxx + margin)
+    ax.set_ylim(miny - margin, maxy + margin)
+    # Only differs from the figure aspect for very narrow plans; widen the
+    # view rather than shrinking the axes
+    ax.set_aspect('equal', adjustable='datalim')
     ax.axis('off')
-    
-    # Get bounds
-    all_coords = []
-    for poly in rooms.values():
-        all_coords.extend(list(poly.exterior.coords))
-    
-    xs = [c[0] for c in all_coords]
-    ys = [c[1] for c in all_coords]
-    margin = 3
-    ax.set_xlim(min(xs) - margin, max(xs) + margin)
-    ax.set_ylim(min(ys) - margin, max(ys) + margin)
-    
-    # Draw room fills
+
+    # Per-room geometry, read once and reused for fills, walls and labels
+    room_coords = _room_exterior_coords(rooms)
+    room_centroids = {}
     for room_name, poly in rooms.items():
-        room_type = room_name.split("_")[0]
-        color = ROOM_COLORS.get(room_type, "#F5F5F5")
-        
-        coords = list(poly.exterior.coords)
-        polygon = patches.Polygon(coords, 
-                                 facecolor=color,
-                                 edgecolor='none',
-                                 alpha=0.85,
-                                 zorder=1)
-        ax.add_patch(polygon)
+        centroid = poly.centroid
+        room_centroids[room_name] = (centroid.x, centroid.y)
+    
+    # Draw room fills (one PolyCollection for all rooms)
+    # Fills are rasterized so vector outputs (PDF/SVG) keep only walls,
+    # doors and labels as vectors
+    fill_colors = [_room_meta(room_name)[2] for room_name in room_coords]
+    fills = PolyCollection(list(room_coords.values()),
+                           facecolors=fill_colors,
+                           edgecolors='none',
+                           alpha=0.85,
+                           zorder=1)
+    fills.set_rasterized(True)
+    ax.add_collection(fills)
     
     # Draw walls with doors
-    wall_segments = get_wall_segments(rooms)
+    # Segments are collected and drawn as two LineCollections (walls, door
+    # gaps) instead of one Line2D artist per segment
+    wall_segments = get_wall_segments(rooms, room_coords)
+    door_idx = match_room_doors(room_coords, door_xy)
+    has_door = door_idx >= 0
+
+    # Solid walls
+    wall_lines = list(wall_segments[~has_door])
+    gap_lines = []
+
+    # Walls with doors - door openings for all of them in one kernel call
+    if has_door.any():
+        door_segments = wall_segments[has_door]
+        door_centers = door_xy[door_idx[has_door]]
+        door_geometry = _door_geometry_batch(door_segments[:, 0], door_segments[:, 1],
+                                             door_centers, DOOR_WIDTH)
 
-    for seg_start, seg_end in wall_segments:
-        door_center, door_poly = find_door_on_segment(seg_start, seg_end, all_doors)
+        # Check which door is the entrance/front door
+        is_entrance = [bool(entrance_geom is not None and door.equals(entrance_geom))
+                       for door in all_doors]
 
-        if door_center:
-            # Check if this is the entrance/front door
-            is_entrance = bool(entrance_geom is not None and door_poly.equals(entrance_geom))
+        for (seg_start, seg_end), i, center, geometry in zip(
+                door_segments, door_idx[has_door], door_centers, door_geometry):
             # Wall has door - draw with opening
-            draw_wall_with_door(ax, seg_start, seg_end, door_center, is_entrance=is_entrance)
-        else:
-            # Solid wall
-            ax.plot([seg_start[0], seg_end[0]],
-                    [seg_start[1], seg_end[1]],
-                    color=WALL_COLOR, linewidth=12, solid_capstyle='butt', zorder=3)
+            wall_segs, gap_seg = draw_wall_with_door(ax, seg_start, seg_end, shapely.Point(center),
+                                                     is_entrance=is_entrance[i], geometry=geometry)
+            wall_lines.extend(wall_segs)
+            if gap_seg is not None:
+                gap_lines.append(gap_seg)
+
+    ax.add_collection(LineCollection(wall_lines, colors=WALL_COLOR, linewidths=12,
+                                     capstyle='butt', zorder=3))
+    if gap_lines:
+        ax.add_collection(LineCollection(gap_lines, colors='white', linewidths=3,
+                                         capstyle='projecting', zorder=4))
     
     # Add room labels
-    for room_name, poly in rooms.items():
-        centroid = poly.centroid
-        room_type = room_name.split("_")[0].upper()
-        room_num = room_name.split("_")[1]
+    for room_name, (cx, cy) in room_centroids.items():
+        room_type, room_num, _ = _room_meta(room_name)
         
         label = f"{room_type}\n{room_num}"
         
-        ax.text(centroid.x, centroid.y, label,
+        ax.text(cx, cy, label,
                ha='center', va='center',
                fontsize=13, fontweight='bold',
                color='#000000',
@@ -197,10 +348,9 @@ def draw_2d_floorplan(layout, filename="floorplan_2d.png"):
                         alpha=0.95),
                zorder=6)
     
-    # Title
-    ax.text(0.5, 0.98, "FLOOR PLAN",
-           transform=ax.transAxes,
-           ha='center', va='top',
+    # Title, centered in the band above the axes
+    fig.text(0.5, 1 - TITLE_BAND / 2 / fig_h, "FLOOR PLAN",
+           ha='center', va='center',
            fontsize=24, fontweight='bold',
            color='#333333',
            bbox=dict(boxstyle='round,pad=0.8', 
@@ -208,11 +358,12 @@ def draw_2d_floorplan(layout, filename="floorplan_2d.png"):
                     edgecolor=WALL_COLOR,
                     linewidth=3))
     
-    plt.tight_layout()
-    plt.savefig(filename, dpi=200, bbox_inches='tight', facecolor='white')
+    # Smaller PNGs: let Pillow optimize the zlib stream
+    save_kwargs = {}
+    if str(filename).lower().endswith(".png"):
+        save_kwargs["pil_kwargs"] = {"optimize": True, "compress_level": 6}
+    fig.savefig(filename, dpi=200, bbox_inches=None, facecolor='white', **save_kwargs)
 
     print(f"📐 2D Floor plan: {filename}")
     print(f"   Rooms: {len(rooms)}")
     print(f"   Doors: {len(all_doors)}")
-
-    plt.close()
\ No newline at end of file
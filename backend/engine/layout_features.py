@@ -1,5 +1,18 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
+import shapely
+from shapely.errors import GEOSException
 from shapely.geometry import Polygon
+from shapely.ops import unary_union
+
+# Below this many layouts, process start-up costs more than it saves
+MIN_PARALLEL_LAYOUTS = 32
+
+# Column order for features_to_array
+FEATURE_NAMES = ("total_area", "convex_hull_area", "exterior_exposure", "avg_distance", "room_count")
 
 def extract_layout_features(layout):
     """
@@ -35,48 +48,86 @@ def extract_layout_features(layout):
     bbox_area = 0
     convex_hull_area = 0
     
-    from shapely.ops import unary_union
-    try:
-        all_polys = [p for p in rooms.values() if not p.is_empty]
-        if all_polys:
+    all_polys = [p for p in rooms.values() if not p.is_empty]
+    union_poly = None
+    if all_polys:
+        try:
             union_poly = unary_union(all_polys)
-            total_area = union_poly.area # Use actual union area (dedup overlaps)
-            
-            convex_hull = union_poly.convex_hull
-            convex_hull_area = convex_hull.area
-            
-            exterior_exposure = union_poly.boundary.length
-    except:
+        except GEOSException:
+            union_poly = None
+
+    if union_poly is not None:
+        total_area = union_poly.area # Use actual union area (dedup overlaps)
+        
+        # Hull of the union == hull of all room vertices, so build it
+        # from the points directly (cheaper than hulling the union)
+        points = shapely.multipoints(shapely.get_coordinates(all_polys))
+        convex_hull_area = shapely.convex_hull(points).area
+        
+        exterior_exposure = union_poly.boundary.length
+    elif all_polys:
         # Fallback if union fails
         convex_hull_area = total_area * 1.2 # Approx
         exterior_exposure = sum(poly.length for poly in rooms.values())
 
     # Connectivity Metric (Average Graph Distance)
+    # Mean of all pairwise centroid distances, from one broadcast over the
+    # (n, n) difference grid instead of a Python double loop
     for name, poly in rooms.items():
         if not poly.is_empty:
             center = poly.centroid
-            room_centers[name] = np.array([center.x, center.y])
+            room_centers[name] = (center.x, center.y)
 
-    names = list(room_centers.keys())
-    dist_sum = 0
-    count = 0
-    
-    if len(names) > 1:
-        for i in range(len(names)):
-            for j in range(i+1, len(names)):
-                d = np.linalg.norm(room_centers[names[i]] - room_centers[names[j]])
-                dist_sum += d
-                count += 1
-        avg_distance = dist_sum / max(count, 1)
+    if len(room_centers) > 1:
+        centers = np.array(list(room_centers.values()))
+        dists = np.linalg.norm(centers[:, None, :] - centers[None, :, :], axis=-1)
+        avg_distance = dists[np.triu_indices(len(centers), k=1)].mean()
     else:
         avg_distance = 0
 
+    # Raw floats: rounding is left to whatever displays them
     features = {
-        "total_area": round(total_area, 2),
-        "convex_hull_area": round(convex_hull_area, 2),
-        "exterior_exposure": round(exterior_exposure, 2),
-        "avg_distance": round(avg_distance, 2),
+        "total_area": float(total_area),
+        "convex_hull_area": float(convex_hull_area),
+        "exterior_exposure": float(exterior_exposure),
+        "avg_distance": float(avg_distance),
         "room_count": len(rooms)
     }
 
     return features
+
+
+def features_to_array(features):
+    """Pack a features dict into a float32 vector ordered as FEATURE_NAMES."""
+    return np.array([features.get(name, 0) for name in FEATURE_NAMES], dtype=np.float32)
+
+
+
+def _extract_room_features(rooms):
+    """Worker entry point: features for one layout's rooms dict."""
+    return extract_layout_features({"rooms": rooms})
+
+
+def extract_layout_features_batch(layouts, max_workers=None):
+    """
+    extract_layout_features for many layouts, spread over a process pool.
+
+    Layouts are independent, so this scales with core count. Only each
+    layout's rooms are sent to the workers (the only input the features
+    use). Small batches are computed in-process.
+
+    Returns a list of feature dicts in input order; use features_to_array
+    (or np.stack of those) for a (N, len(FEATURE_NAMES)) float32 matrix.
+    """
+    rooms_list = [layout.get("rooms", {}) for layout in layouts]
+    workers = max_workers or os.cpu_count() or 1
+
+    if workers <= 1 or len(rooms_list) < MIN_PARALLEL_LAYOUTS:
+        return [_extract_room_features(rooms) for rooms in rooms_list]
+
+    chunksize = max(1, len(rooms_list) // (workers * 4))
+    # Spawned rather than forked (as on Windows): forking after numba's
+    # parallel kernels (3D export, batch scoring) have started their thread
+    # pool deadlocks the workers
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(_extract_room_features, rooms_list, chunksize=chunksize))
@@ -1,14 +1,16 @@
 from shapely.geometry import box, Point, Polygon, LineString
 from shapely.ops import unary_union
+import shapely
 import numpy as np
-import random
+from numba import njit
 import logging
+from collections import defaultdict
 
 logger = logging.getLogger(__name__)
 
 from adjacency_rules import ADJACENCY_RULES, validate_adjacency
 from corridor_generator import generate_corridors
-from door_generator import generate_doors
+from door_generator import generate_door_polygons
 
 # =========================
 # CONSTANTS
@@ -18,6 +20,14 @@ DOOR_WIDTH = 1.4
 OPEN_SPACE_WIDTH = 3.2
 WALL_TOLERANCE = 0.5
 JITTER = 0.15  # Small positional noise
+EDGE_EPS = 1e-9  # Box edges closer than this are treated as flush
+SIDES = ('right', 'left', 'top', 'bottom')  # _place_adjacent candidate order
+
+# Base aspect ratios drawn per room, by placement phase
+_AR_CORE = (1.2, 1.5, 1.8, 0.8)
+_AR_DINING = (1.1, 1.4, 1.0)
+_AR_KITCHEN = (1.0, 1.3, 0.9)
+_AR_BEDROOM = (1.1, 1.4, 1.0)
 
 # =========================
 # DEFAULT CONFIG
@@ -28,6 +38,7 @@ DEFAULT_CONFIG = {
     "MAX_ROW_WIDTH": 40.0,
     "RANDOM_SEED": None,
     "adjacency_pairs": [],
+    "VERBOSE": True,  # Progress prints; turn off when synthesizing in bulk
 }
 
 ZONES = {
@@ -38,20 +49,64 @@ ZONES = {
     "service": ["bathroom", "storage", "utility"],
 }
 
+def _quiet(*args, **kwargs):
+    pass
+
+def _progress_printer(cfg):
+    """print when cfg["VERBOSE"] is set, otherwise a no-op"""
+    return print if cfg.get("VERBOSE") else _quiet
+
+# Reverse lookup: room type -> zone
+_TYPE_TO_ZONE = {t: zone for zone, types in ZONES.items() for t in types}
+
 def get_zone(room_type):
-    for zone, types in ZONES.items():
-        if room_type in types:
-            return zone
-    return "other"
+    return _TYPE_TO_ZONE.get(room_type, "other")
 
-def _random_aspect_ratio(base_ratio=1.5, variance=0.5):
+def _random_aspect_ratio(rng, base_ratio=1.5, variance=0.5):
     min_ratio = max(0.8, base_ratio - variance)
     max_ratio = min(2.0, base_ratio + variance)
-    return random.uniform(min_ratio, max_ratio)
+    return rng.uniform(min_ratio, max_ratio)
+
+def _pick(rng, seq):
+    """rng-driven random.choice (keeps the element's own type)"""
+    return seq[rng.integers(len(seq))]
+
+@njit(cache=True)
+def _score_candidates(cand_bounds, existing_bounds, eps):
+    """
+    Contact score (shared perimeter) of each candidate box against all
+    existing boxes; -inf where the candidate overlaps an existing room.
+
+    All rooms are axis-aligned boxes, so overlap and contact come straight
+    from the (minx, miny, maxx, maxy) bounds: flush left/right edges share
+    their vertical overlap, flush top/bottom edges their horizontal overlap.
+    """
+    scores = np.zeros(cand_bounds.shape[0])
+    for k in range(cand_bounds.shape[0]):
+        cx0, cy0, cx1, cy1 = cand_bounds[k, 0], cand_bounds[k, 1], cand_bounds[k, 2], cand_bounds[k, 3]
+        contact = 0.0
+        for i in range(existing_bounds.shape[0]):
+            ex0, ey0, ex1, ey1 = existing_bounds[i, 0], existing_bounds[i, 1], existing_bounds[i, 2], existing_bounds[i, 3]
+            overlap_w = max(0.0, min(cx1, ex1) - max(cx0, ex0))
+            overlap_h = max(0.0, min(cy1, ey1) - max(cy0, ey0))
+
+            # Invalid (Overlap)
+            if overlap_w * overlap_h > 1e-6:
+                contact = -np.inf
+                break
+
+            if abs(cx1 - ex0) < eps or abs(cx0 - ex1) < eps:
+                contact += overlap_h
+            if abs(cy1 - ey0) < eps or abs(cy0 - ey1) < eps:
+                contact += overlap_w
+        scores[k] = contact
+    return scores
 
-def _place_adjacent(base_poly, width, height, existing_polys, preferred_sides=None):
+def _place_adjacent(base_poly, width, height, existing_polys, preferred_sides=None, existing_bounds=None):
     """
     Place room adjacent to base_poly.
+    existing_polys: list of the rooms placed so far.
+    existing_bounds: optional (N, 4) bounds of existing_polys (same order).
     Priority:
     1. Matches preferred_sides (if provided).
     2. MAXIMIZES shared perimeter with ALL existing polys (Gap Filling / Corner Logic).
@@ -64,96 +119,45 @@ def _place_adjacent(base_poly, width, height, existing_polys, preferred_sides=No
     
     minx, miny, maxx, maxy = base_poly.bounds
     
-    all_placements = {
-        'right': box(maxx, miny, maxx + width, miny + height),
-        'left': box(minx - width, miny, minx, miny + height),
-        'top': box(minx, maxy, minx + width, maxy + height),
-        'bottom': box(minx, miny - height, minx + width, miny),
-    }
-    
-    # 1. Filter by Preference
-    if preferred_sides:
-        candidates = [all_placements[s] for s in preferred_sides if s in all_placements]
-        # Add non-preferred as fallback (lower priority? For now just mix them in if needed, but let's stick to strict preference first)
-        # Actually, if we are smart about scoring, we can consider ALL valid placements and just give a bonus to preferred sides.
-        # Let's try to stick to the requested preference strictness first, then fallback.
-    else:
-        candidates = list(all_placements.values())
-        
-    # If no preferred candidates logic (simplified above), just use all if preference failed?
-    # No, the previous logic fell back to others. Let's do:
-    primary_candidates = []
-    secondary_candidates = []
-    
-    for s, p in all_placements.items():
-        if preferred_sides and s in preferred_sides:
-            primary_candidates.append(p)
-        else:
-            secondary_candidates.append(p)
-            
-    # Try per-candidate validation
-    valid_candidates = []
-    
-    # Helper to check validity and score
-    def evaluate_candidate(cand, loops_list):
-        # 1. Check Overlaps
-        for existing in loops_list:
-            if cand.intersects(existing):
-                if cand.intersection(existing).area > 1e-6:
-                    return None # Invalid (Overlap)
-        
-        # 2. Calculate Contact Score (Shared Perimeter)
-        contact_length = 0
-        cand_boundary = cand.boundary
-        for existing in loops_list:
-            if cand.touches(existing) or cand.intersects(existing): # Intersects handles flush edges too
-                 intersection = cand.intersection(existing)
-                 # If intersection is line (touching), add length
-                 # Intersection of boxes is often a box or line
-                 # Actually `intersection` of two adjacent boxes is a LineString.
-                 common = cand_boundary.intersection(existing.boundary)
-                 if not common.is_empty:
-                     contact_length += common.length
-        return contact_length
-
-    # Check Primary
-    from shapely.geometry import Polygon
-    # existing_polys is a dict_values or list. Convert to list for iteration.
-    poly_list = list(existing_polys)
-    
-    for cand in primary_candidates:
-        score = evaluate_candidate(cand, poly_list)
-        if score is not None:
-            valid_candidates.append((cand, score + 100)) # Bonus for preferred
-            
-    # Check Secondary (Fallback)
-    if not valid_candidates:
-        for cand in secondary_candidates:
-            score = evaluate_candidate(cand, poly_list)
-            if score is not None:
-                valid_candidates.append((cand, score))
-    
-    if not valid_candidates:
-        return None
-        
-    # Sort by Contact Score (Descending)
-    # This favors "Corner Filling" (touching 2 sides > touching 1 side)
-    valid_candidates.sort(key=lambda x: x[1], reverse=True)
-    
-    # Pick top 1 (Deterministically best fit) or Weighted random?
-    # Deterministic encourages compactness.
-    return valid_candidates[0][0]
+    # Candidates are plain (minx, miny, maxx, maxy) rows, in SIDES order;
+    # only the winner is turned into a Polygon
+    cand_bounds = np.array([
+        (maxx, miny, maxx + width, miny + height),          # right
+        (minx - width, miny, minx, miny + height),          # left
+        (minx, maxy, minx + width, maxy + height),          # top
+        (minx, miny - height, minx + width, miny),          # bottom
+    ])
+
+    if existing_bounds is None:
+        existing_bounds = shapely.bounds(np.asarray(existing_polys, dtype=object)).reshape(-1, 4)
+
+    scores = _score_candidates(cand_bounds, np.ascontiguousarray(existing_bounds, dtype=float), EDGE_EPS)
+
+    # Preferred sides first; the rest only if no preferred side fits
+    primary = np.array([bool(preferred_sides) and s in preferred_sides for s in SIDES])
+    for group in (primary, ~primary):
+        valid = group & np.isfinite(scores)
+        if valid.any():
+            # Highest Contact Score wins, first side on ties
+            # This favors "Corner Filling" (touching 2 sides > touching 1 side)
+            # Deterministic encourages compactness.
+            best = int(np.argmax(np.where(valid, scores, -np.inf)))
+            return box(*cand_bounds[best])
 
-def _place_with_area_constraint(room_type, target_area, base_poly, existing_polys, preferred_sides=None, tolerance=0.15, max_retries=5):
+    return None
+
+def _place_with_area_constraint(room_type, target_area, base_poly, existing_polys, preferred_sides=None, tolerance=0.15, max_retries=5, rng=None):
     """
     Place room with area constraint and retry logic for tolerance compliance.
     Returns (polygon, actual_area) or (None, None) if failed.
     """
+    if rng is None:
+        rng = np.random.default_rng()
     for attempt in range(max_retries):
         # Vary aspect ratio slightly on each retry
         base_ratio = 1.5
         variance = 0.3 * (attempt + 1) / max_retries  # Increase variance with retries
-        aspect_ratio = _random_aspect_ratio(base_ratio, variance)
+        aspect_ratio = _random_aspect_ratio(rng, base_ratio, variance)
         
         # Calculate dimensions from target area and aspect ratio
         width = np.sqrt(target_area * aspect_ratio)
@@ -179,13 +183,34 @@ def _place_with_area_constraint(room_type, target_area, base_poly, existing_poly
         return poly, poly.area
     return None, None
 
-def _get_external_walls(poly, all_other_polys):
-    boundary = poly.boundary
-    if all_other_polys:
-        other_boundaries = unary_union([p.boundary for p in all_other_polys if not p.is_empty])
+def _get_external_walls(poly, all_other_polys, boundary=None, other_boundaries=None):
+    """
+    Wall segments of poly not shared with any other room.
+
+    boundary / other_boundaries: optional precomputed boundaries of poly and
+    of all_other_polys (same order), so callers that already built them
+    don't pay for another GEOS boundary op per room.
+    """
+    if boundary is None:
+        boundary = poly.boundary
+
+    others = np.asarray(all_other_polys, dtype=object).reshape(-1)
+    if len(others):
+        # Only rooms that touch poly can share a wall with it; an STRtree
+        # query finds them ('intersects' rather than 'touches' so a room
+        # overlapping by float noise still counts)
+        near = shapely.STRtree(others).query(poly, predicate="intersects")
+        if other_boundaries is None:
+            other_boundaries = shapely.boundary(others[near])
+        else:
+            other_boundaries = np.asarray(other_boundaries, dtype=object)[near]
+
+    if other_boundaries is not None and len(other_boundaries):
+        # Shared walls coincide exactly with a neighbour's boundary, so the
+        # plain difference removes them (no buffered union needed)
+        external = boundary.difference(shapely.union_all(other_boundaries))
     else:
-        other_boundaries = Polygon()
-    external = boundary.difference(other_boundaries.buffer(1e-6))
+        external = boundary
     
     segments = []
     if external.is_empty:
@@ -199,9 +224,28 @@ def _get_external_walls(poly, all_other_polys):
                 segments.append(geom)
     return segments
 
-def _generate_entrance_door(living_room_poly, all_rooms):
-    other_rooms = [p for name, p in all_rooms.items() if name != next((k for k in all_rooms if k.startswith("living")), "")]
-    external_walls = _get_external_walls(living_room_poly, other_rooms)
+def _generate_entrance_door(living_room_poly, all_rooms, boundaries=None, living_name=None, rng=None):
+    """
+    Entrance door polygon on an external wall of the living room.
+
+    boundaries: optional {room_name: boundary} cache for all_rooms.
+    living_name: key of living_room_poly in all_rooms (looked up if omitted).
+    rng: numpy Generator for the wall / position choice.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    if living_name is None:
+        living_name = next((k for k in all_rooms if k.startswith("living")), "")
+    other_names = [name for name in all_rooms if name != living_name]
+    other_rooms = [all_rooms[name] for name in other_names]
+    if boundaries is not None:
+        external_walls = _get_external_walls(
+            living_room_poly, other_rooms,
+            boundary=boundaries.get(living_name),
+            other_boundaries=[boundaries[name] for name in other_names],
+        )
+    else:
+        external_walls = _get_external_walls(living_room_poly, other_rooms)
     
     if not external_walls:
         return None
@@ -211,8 +255,8 @@ def _generate_entrance_door(living_room_poly, all_rooms):
         return None
     
     valid_walls.sort(key=lambda w: w.length, reverse=True)
-    best_wall = random.choice(valid_walls[:3])
-    t = random.uniform(0.2, 0.8)
+    best_wall = _pick(rng, valid_walls[:3])
+    t = rng.uniform(0.2, 0.8)
     mid_point = best_wall.interpolate(t, normalized=True)
     
     coords = list(best_wall.coords)
@@ -239,14 +283,13 @@ def _generate_entrance_door(living_room_poly, all_rooms):
         (mid_point.x - nx*w + px*d, mid_point.y - ny*w + py*d),
     ])
 
-def _determine_opening_width(r1, r2):
-    t1 = r1.split("_")[0]
-    t2 = r2.split("_")[0]
+def _determine_opening_width(t1, t2):
+    """Opening width between two rooms, given their room types"""
     if {t1, t2} == {"living", "kitchen"}:
         return OPEN_SPACE_WIDTH
     return DOOR_WIDTH
 
-def _get_compact_sides(existing_layouts):
+def _get_compact_sides(existing_layouts, rng=None):
     """
     Determine preferred placement sides to maintain a compact (square-ish) footprint.
     Returns list of sides ['top', 'bottom',...] sorted by preference.
@@ -254,14 +297,38 @@ def _get_compact_sides(existing_layouts):
     if not existing_layouts:
         return ['right', 'left', 'top', 'bottom']
         
-    # Calculate current bounding box
-    minx, miny, maxx, maxy = float('inf'), float('inf'), float('-inf'), float('-inf')
-    for poly in existing_layouts.values():
-        x0, y0, x1, y1 = poly.bounds
-        minx = min(minx, x0)
-        miny = min(miny, y0)
-        maxx = max(maxx, x1)
-        maxy = max(maxy, y1)
+    # Calculate current bounding box (one vectorized bounds call + reduction)
+    bounds = shapely.bounds(np.fromiter(existing_layouts.values(), dtype=object, count=len(existing_layouts)))
+    minx, miny = bounds[:, :2].min(axis=0)
+    maxx, maxy = bounds[:, 2:].max(axis=0)
+    return _get_compact_sides_fast([minx, miny, maxx, maxy], rng)
+
+def _new_floor_bbox():
+    """Empty running [minx, miny, maxx, maxy] for _extend_floor_bbox"""
+    return [np.inf, np.inf, -np.inf, -np.inf]
+
+def _extend_floor_bbox(floor_bbox, poly):
+    """Grow the running floor bounding box in place to cover poly"""
+    x0, y0, x1, y1 = poly.bounds
+    floor_bbox[0] = min(floor_bbox[0], x0)
+    floor_bbox[1] = min(floor_bbox[1], y0)
+    floor_bbox[2] = max(floor_bbox[2], x1)
+    floor_bbox[3] = max(floor_bbox[3], y1)
+
+def _record_placement(placed_polys, placed_bounds, floor_bbox, poly):
+    """Append poly to the floor's placed list / bounds array and grow its bbox"""
+    placed_bounds[len(placed_polys)] = poly.bounds
+    placed_polys.append(poly)
+    _extend_floor_bbox(floor_bbox, poly)
+
+def _get_compact_sides_fast(floor_bbox, rng=None):
+    """
+    _get_compact_sides from the floor's running bounding box
+    [minx, miny, maxx, maxy] (kept by the caller) instead of every room.
+    """
+    minx, miny, maxx, maxy = floor_bbox
+    if minx > maxx:
+        return ['right', 'left', 'top', 'bottom']
         
     width = maxx - minx
     height = maxy - miny
@@ -278,10 +345,12 @@ def _get_compact_sides(existing_layouts):
     elif aspect < 0.8:
         return ['right', 'left', 'top', 'bottom']
     else:
-        random.shuffle(sides)
+        if rng is None:
+            rng = np.random.default_rng()
+        rng.shuffle(sides)
         return sides
 
-def _preferred_partners(room_type: str, layouts: dict, adjacency_pairs: list) -> list:
+def _preferred_partners(room_type: str, layouts: dict, adjacency_pairs: list, by_type: dict = None) -> list:
     partners = []
     for pair in adjacency_pairs or []:
         if not isinstance(pair, (list, tuple)) or len(pair) != 2:
@@ -293,7 +362,9 @@ def _preferred_partners(room_type: str, layouts: dict, adjacency_pairs: list) ->
         elif b == room_type:
             partner_type = a
 
-        if partner_type:
+        if partner_type and by_type is not None:
+            partners.extend(by_type.get(partner_type, ()))
+        elif partner_type:
             for name in layouts:
                 if name.startswith(partner_type + "_") or name == partner_type:
                     partners.append(name)
@@ -305,9 +376,17 @@ def _try_place_with_soft_constraints(
     height: float,
     layouts: dict,
     adjacency_pairs: list,
+    floor_bbox: list = None,
+    placed_polys: list = None,
+    placed_bounds=None,
+    by_type: dict = None,
+    rng=None,
 ):
-    partners = _preferred_partners(room_type, layouts, adjacency_pairs)
-    compact_sides = _get_compact_sides(layouts)
+    partners = _preferred_partners(room_type, layouts, adjacency_pairs, by_type)
+    if floor_bbox is not None:
+        compact_sides = _get_compact_sides_fast(floor_bbox, rng)
+    else:
+        compact_sides = _get_compact_sides(layouts, rng)
 
     for partner_name in partners:
         if partner_name not in layouts:
@@ -317,24 +396,31 @@ def _try_place_with_soft_constraints(
         if not is_valid:
             continue
 
-        poly = _place_adjacent(layouts[partner_name], width, height, layouts.values(), compact_sides)
+        if placed_polys is not None:
+            poly = _place_adjacent(layouts[partner_name], width, height, placed_polys, compact_sides, existing_bounds=placed_bounds)
+        else:
+            poly = _place_adjacent(layouts[partner_name], width, height, list(layouts.values()), compact_sides)
         if poly:
             return poly
 
     return None
 
-def synthesize_single_floor(spec, config=None):
-    cfg = {**DEFAULT_CONFIG, **(config or {})}
+def synthesize_single_floor(spec, config=None, rng=None):
+    """
+    Place every spec room on one floor. All randomness comes from rng (a
+    numpy Generator, seeded from cfg["RANDOM_SEED"] when not given), so
+    no global random state is touched and floors can be built in parallel.
+    """
+    cfg = DEFAULT_CONFIG | (config or {})
+    _log = _progress_printer(cfg)
     adjacency_pairs = cfg.get("adjacency_pairs", [])
-    if cfg.get("RANDOM_SEED") is not None:
-        random.seed(cfg["RANDOM_SEED"])
-        np.random.seed(cfg["RANDOM_SEED"])
+    if rng is None:
+        rng = np.random.default_rng(cfg.get("RANDOM_SEED"))
     
     if not spec.get("rooms"):
         raise ValueError("Spec must contain non-empty 'rooms' list")
     
-    rooms_by_zone = {k: [] for k in ZONES.keys()}
-    rooms_by_zone["other"] = []
+    rooms_by_zone = {zone: [] for zone in (*ZONES, "other")}
     
     for i, room in enumerate(spec["rooms"]):
         r_type = room.get("type")
@@ -348,8 +434,16 @@ def synthesize_single_floor(spec, config=None):
     
     layouts = {}
     room_index = {}
+    # Running footprint of the placed rooms, for the compactness bias
+    floor_bbox = _new_floor_bbox()
+    # Placed rooms in placement order, with their bounds in a preallocated
+    # (n_rooms, 4) array, so _place_adjacent never rebuilds either
+    placed_polys = []
+    placed_bounds = np.empty((len(spec["rooms"]), 4))
+    # Placed room names bucketed by room type, in placement order
+    by_type = defaultdict(list)
     
-    print("\n🏗️  Building house with architectural zones:")
+    _log("\n🏗️  Building house with architectural zones:")
     
     # PHASE 1: CORE (LIVING)
     living_rooms = rooms_by_zone["public"]
@@ -360,16 +454,18 @@ def synthesize_single_floor(spec, config=None):
         r_type = room["type"]
         area = float(room["area"])
         # High Variance for Core
-        base_ar = random.choice([1.2, 1.5, 1.8, 0.8])
-        aspect_ratio = _random_aspect_ratio(base_ar, 0.5)
+        base_ar = _pick(rng, _AR_CORE)
+        aspect_ratio = _random_aspect_ratio(rng, base_ar, 0.5)
         height = (area / aspect_ratio) ** 0.5
         width = aspect_ratio * height
         room_index[r_type] = 1
         room_name = f"{r_type}_1"
         poly = box(0, 0, width, height)
         layouts[room_name] = poly
+        _record_placement(placed_polys, placed_bounds, floor_bbox, poly)
+        by_type[r_type].append(room_name)
         core_room = room_name
-        print(f"  🏠 CORE: {room_name} (hub)")
+        _log(f"  🏠 CORE: {room_name} (hub)")
         
         core_poly = layouts[core_room]
 
@@ -377,21 +473,23 @@ def synthesize_single_floor(spec, config=None):
         for room in living_rooms[1:]:
             r_type = room["type"]
             area = float(room["area"])
-            base_ar = random.choice([1.1, 1.4, 1.0])
-            aspect_ratio = _random_aspect_ratio(base_ar, 0.4)
+            base_ar = _pick(rng, _AR_DINING)
+            aspect_ratio = _random_aspect_ratio(rng, base_ar, 0.4)
             height = (area / aspect_ratio) ** 0.5
             width = aspect_ratio * height
             room_index[r_type] = room_index.get(r_type, 0) + 1
             room_name = f"{r_type}_{room_index[r_type]}"
             
-            poly = _try_place_with_soft_constraints(r_type, width, height, layouts, adjacency_pairs)
+            poly = _try_place_with_soft_constraints(r_type, width, height, layouts, adjacency_pairs, floor_bbox, placed_polys, placed_bounds[:len(placed_polys)], by_type, rng)
             if not poly:
-                preferred_sides = _get_compact_sides(layouts)
-                poly = _place_adjacent(core_poly, width, height, layouts.values(), preferred_sides)
+                preferred_sides = _get_compact_sides_fast(floor_bbox, rng)
+                poly = _place_adjacent(core_poly, width, height, placed_polys, preferred_sides, existing_bounds=placed_bounds[:len(placed_polys)])
             
             if poly:
                 layouts[room_name] = poly
-                print(f"  🍽️  DINING/PUBLIC: {room_name} (attached to core)")
+                _record_placement(placed_polys, placed_bounds, floor_bbox, poly)
+                by_type[r_type].append(room_name)
+                _log(f"  🍽️  DINING/PUBLIC: {room_name} (attached to core)")
     
     if not core_room:
         # No explicit living room — try to use any placed room as core anchor.
@@ -399,7 +497,7 @@ def synthesize_single_floor(spec, config=None):
         if layouts:
             core_room = next(iter(layouts))
             core_poly = layouts[core_room]
-            print(f"  ⚠️  No living room in spec — using '{core_room}' as layout anchor")
+            _log(f"  ⚠️  No living room in spec — using '{core_room}' as layout anchor")
         else:
             raise ValueError(
                 "Cannot synthesize layout: spec contains no placeable rooms. "
@@ -416,32 +514,34 @@ def synthesize_single_floor(spec, config=None):
     for room in rooms_by_zone.get("circulation", []):
         r_type = room["type"]
         area   = float(room["area"])
-        # Hallways are rectangular. Use random.uniform directly instead of
+        # Hallways are rectangular. Use rng.uniform directly instead of
         # _random_aspect_ratio(2.5, 0.5) because that helper clamps both bounds
         # to 2.0 (max(0.8, 2.0) and min(2.0, 3.0)), producing the identical
         # rectangle on every seed and making hallway placement fail consistently.
-        aspect_ratio = random.uniform(1.5, 3.0)
+        aspect_ratio = rng.uniform(1.5, 3.0)
         height = (area / aspect_ratio) ** 0.5
         width  = aspect_ratio * height
         room_index[r_type] = room_index.get(r_type, 0) + 1
         room_name = f"{r_type}_{room_index[r_type]}"
 
-        poly = _try_place_with_soft_constraints(r_type, width, height, layouts, adjacency_pairs)
+        poly = _try_place_with_soft_constraints(r_type, width, height, layouts, adjacency_pairs, floor_bbox, placed_polys, placed_bounds[:len(placed_polys)], by_type, rng)
 
         if not poly:
             # Prefer compact sides of core (builds inward, leaves perimeter for daylight)
-            compact_sides = _get_compact_sides(layouts)
-            poly = _place_adjacent(core_poly, width, height, layouts.values(), compact_sides)
+            compact_sides = _get_compact_sides_fast(floor_bbox, rng)
+            poly = _place_adjacent(core_poly, width, height, placed_polys, compact_sides, existing_bounds=placed_bounds[:len(placed_polys)])
 
         if not poly:
             # Last resort: any side of core
-            poly = _place_adjacent(core_poly, width, height, layouts.values())
+            poly = _place_adjacent(core_poly, width, height, placed_polys, existing_bounds=placed_bounds[:len(placed_polys)])
 
         if poly:
             layouts[room_name] = poly
-            print(f"  🚪 CIRCULATION: {room_name} (spine adjacent to core)")
+            _record_placement(placed_polys, placed_bounds, floor_bbox, poly)
+            by_type[r_type].append(room_name)
+            _log(f"  🚪 CIRCULATION: {room_name} (spine adjacent to core)")
         else:
-            print(f"  ⚠️  CIRCULATION: {room_name} could not be placed — will retry in Phase 5")
+            _log(f"  ⚠️  CIRCULATION: {room_name} could not be placed — will retry in Phase 5")
     # ────────────────────────────────────────────────────────────────────────
     
     # PHASE 2: KITCHEN
@@ -449,93 +549,97 @@ def synthesize_single_floor(spec, config=None):
     for room in kitchen_rooms:
         r_type = room["type"]
         area = float(room["area"])
-        base_ar = random.choice([1.0, 1.3, 0.9])
-        aspect_ratio = _random_aspect_ratio(base_ar, 0.3)
+        base_ar = _pick(rng, _AR_KITCHEN)
+        aspect_ratio = _random_aspect_ratio(rng, base_ar, 0.3)
         height = (area / aspect_ratio) ** 0.5
         width = aspect_ratio * height
         room_index[r_type] = room_index.get(r_type, 0) + 1
         room_name = f"{r_type}_{room_index[r_type]}"
         
         # Priority: Attach to DINING if exists, else Core
-        dining_rooms = [r for r in layouts.keys() if "dining" in r]
+        dining_rooms = by_type["dining"]
         
-        poly = _try_place_with_soft_constraints(r_type, width, height, layouts, adjacency_pairs)
+        poly = _try_place_with_soft_constraints(r_type, width, height, layouts, adjacency_pairs, floor_bbox, placed_polys, placed_bounds[:len(placed_polys)], by_type, rng)
         if not poly and dining_rooms:
             # Try attaching to dining first (Living -> Dining -> Kitchen flow)
             for dining in dining_rooms:
-                preferred_sides = _get_compact_sides(layouts)
-                poly = _place_adjacent(layouts[dining], width, height, layouts.values(), preferred_sides)
+                preferred_sides = _get_compact_sides_fast(floor_bbox, rng)
+                poly = _place_adjacent(layouts[dining], width, height, placed_polys, preferred_sides, existing_bounds=placed_bounds[:len(placed_polys)])
                 if poly:
-                    print(f"  🍳 SEMI-PUBLIC: {room_name} (attached to {dining})")
+                    _log(f"  🍳 SEMI-PUBLIC: {room_name} (attached to {dining})")
                     break
         
         if not poly:
              # Fallback to Core
-             preferred_sides = _get_compact_sides(layouts)
-             poly = _place_adjacent(core_poly, width, height, layouts.values(), preferred_sides[:2])
+             preferred_sides = _get_compact_sides_fast(floor_bbox, rng)
+             poly = _place_adjacent(core_poly, width, height, placed_polys, preferred_sides[:2], existing_bounds=placed_bounds[:len(placed_polys)])
              if poly:
-                 print(f"  🍳 SEMI-PUBLIC: {room_name} (attached to core)")
+                 _log(f"  🍳 SEMI-PUBLIC: {room_name} (attached to core)")
         
         if poly:
             layouts[room_name] = poly
+            _record_placement(placed_polys, placed_bounds, floor_bbox, poly)
+            by_type[r_type].append(room_name)
 
     # PHASE 3: BEDROOMS
     bedrooms = rooms_by_zone["private"]
     # Randomize order of bedrooms
-    random.shuffle(bedrooms)
+    rng.shuffle(bedrooms)
     bedroom_names = []
     for idx, room in enumerate(bedrooms):
         r_type = room["type"]
         area = float(room["area"])
-        base_ar = random.choice([1.1, 1.4, 1.0])
-        aspect_ratio = _random_aspect_ratio(base_ar, 0.4)
+        base_ar = _pick(rng, _AR_BEDROOM)
+        aspect_ratio = _random_aspect_ratio(rng, base_ar, 0.4)
         height = (area / aspect_ratio) ** 0.5
         width = aspect_ratio * height
         room_index[r_type] = room_index.get(r_type, 0) + 1
         room_name = f"{r_type}_{room_index[r_type]}"
         
         # Use Compactness Bias
-        preferred_sides = _get_compact_sides(layouts)
+        preferred_sides = _get_compact_sides_fast(floor_bbox, rng)
         
-        poly = _try_place_with_soft_constraints(r_type, width, height, layouts, adjacency_pairs)
+        poly = _try_place_with_soft_constraints(r_type, width, height, layouts, adjacency_pairs, floor_bbox, placed_polys, placed_bounds[:len(placed_polys)], by_type, rng)
         if not poly:
             # Prefer attaching to Core (Hall/Living) to ensure access
             # NOT attaching to other bedrooms to avoid daisy-chaining without doors
-            poly = _place_adjacent(core_poly, width, height, layouts.values(), preferred_sides[:3])
+            poly = _place_adjacent(core_poly, width, height, placed_polys, preferred_sides[:3], existing_bounds=placed_bounds[:len(placed_polys)])
         
         if not poly:
              # Try other public rooms (Dining?)
-             public_rooms = [r for r in layouts.keys() if "dining" in r or "living" in r]
+             public_rooms = by_type["living"] + by_type["dining"]
              for pub in public_rooms:
-                 poly = _place_adjacent(layouts[pub], width, height, layouts.values(), preferred_sides)
+                 poly = _place_adjacent(layouts[pub], width, height, placed_polys, preferred_sides, existing_bounds=placed_bounds[:len(placed_polys)])
                  if poly:
-                     print(f"  🛏️  PRIVATE: {room_name} (attached to {pub})")
+                     _log(f"  🛏️  PRIVATE: {room_name} (attached to {pub})")
                      break
 
         if poly:
             layouts[room_name] = poly
+            _record_placement(placed_polys, placed_bounds, floor_bbox, poly)
+            by_type[r_type].append(room_name)
             if r_type == "bedroom":
                 bedroom_names.append(room_name)
-            print(f"  🛏️  PRIVATE: {room_name} (branch from core/public)")
+            _log(f"  🛏️  PRIVATE: {room_name} (branch from core/public)")
         else:
-            print(f"  ❌ FAILED to place {room_name} (No valid public adjacency)")
+            _log(f"  ❌ FAILED to place {room_name} (No valid public adjacency)")
     
     # PHASE 4: SERVICES (Bathrooms, Storage, Utility)
     services = rooms_by_zone["service"]
-    study_names = [name for name in layouts.keys() if name.startswith("study")]
+    study_names = list(by_type["study"])
     
     bathroom_idx = 0
     
     for idx, room in enumerate(services):
         r_type = room["type"]
         area = float(room["area"])
-        aspect_ratio = _random_aspect_ratio(1.0, 0.2)
+        aspect_ratio = _random_aspect_ratio(rng, 1.0, 0.2)
         height = (area / aspect_ratio) ** 0.5
         width = aspect_ratio * height
         room_index[r_type] = room_index.get(r_type, 0) + 1
         room_name = f"{r_type}_{room_index[r_type]}"
         
-        poly = _try_place_with_soft_constraints(r_type, width, height, layouts, adjacency_pairs)
+        poly = _try_place_with_soft_constraints(r_type, width, height, layouts, adjacency_pairs, floor_bbox, placed_polys, placed_bounds[:len(placed_polys)], by_type, rng)
         
         # Strategy 1: Ensuite Bathroom (attach to corresponding bedroom, or study if bedrooms are full)
         if not poly and r_type == "bathroom":
@@ -550,10 +654,10 @@ def synthesize_single_floor(spec, config=None):
                 
             if target_room:
                  # Use compactness bias even for ensuites
-                 preferred_sides = _get_compact_sides(layouts)
-                 poly = _place_adjacent(layouts[target_room], width, height, layouts.values(), preferred_sides)
+                 preferred_sides = _get_compact_sides_fast(floor_bbox, rng)
+                 poly = _place_adjacent(layouts[target_room], width, height, placed_polys, preferred_sides, existing_bounds=placed_bounds[:len(placed_polys)])
                  if poly:
-                     print(f"  🚿 SERVICE: {room_name} (ensuite to {target_room})")
+                     _log(f"  🚿 SERVICE: {room_name} (ensuite to {target_room})")
 
         # Strategy 2: Common Bath / Storage / Utility
         # Attach to Hall/Living or Kitchen or Corridor
@@ -562,66 +666,70 @@ def synthesize_single_floor(spec, config=None):
             
             # Storage/Utility prefers Kitchen
             if r_type in ["storage", "utility", "pantry"]:
-                preferred_targets.extend([n for n in layouts if "kitchen" in n])
+                preferred_targets.extend(by_type["kitchen"])
             
             # Common Bath prefers Living/Hall
             if r_type == "bathroom":
-                preferred_targets.extend([n for n in layouts if "living" in n])
-                preferred_targets.extend([n for n in layouts if "study" in n]) # Fallback to any study
+                preferred_targets.extend(by_type["living"])
+                preferred_targets.extend(by_type["study"]) # Fallback to any study
                 
             # Fallback for all: Living/Hall
-            preferred_targets.extend([n for n in layouts if "living" in n])
+            preferred_targets.extend(by_type["living"])
             
             # Try preferred
-            compact_sides = _get_compact_sides(layouts)
+            compact_sides = _get_compact_sides_fast(floor_bbox, rng)
             for target in preferred_targets:
                 if target in layouts:
-                    poly = _place_adjacent(layouts[target], width, height, layouts.values(), compact_sides)
+                    poly = _place_adjacent(layouts[target], width, height, placed_polys, compact_sides, existing_bounds=placed_bounds[:len(placed_polys)])
                     if poly:
-                        print(f"  🔧 SERVICE: {room_name} (attached to {target})")
+                        _log(f"  🔧 SERVICE: {room_name} (attached to {target})")
                         break
         
         # Strategy 3: Desperation (Attach to anything anywhere)
         if not poly:
              all_rooms = list(layouts.keys())
-             random.shuffle(all_rooms)
-             compact_sides = _get_compact_sides(layouts)
+             rng.shuffle(all_rooms)
+             compact_sides = _get_compact_sides_fast(floor_bbox, rng)
              for target in all_rooms:
-                 poly = _place_adjacent(layouts[target], width, height, layouts.values(), compact_sides)
+                 poly = _place_adjacent(layouts[target], width, height, placed_polys, compact_sides, existing_bounds=placed_bounds[:len(placed_polys)])
                  if poly:
-                     print(f"  🔧 SERVICE: {room_name} (fallback attached to {target})")
+                     _log(f"  🔧 SERVICE: {room_name} (fallback attached to {target})")
                      break
 
         if poly:
             layouts[room_name] = poly
+            _record_placement(placed_polys, placed_bounds, floor_bbox, poly)
+            by_type[r_type].append(room_name)
         else:
-            print(f"  ❌ FAILED to place {room_name}")
+            _log(f"  ❌ FAILED to place {room_name}")
     
     # PHASE 5: OTHER (balcony, etc.)
     for room in rooms_by_zone["other"]:
         r_type = room["type"]
         area = float(room["area"])
-        aspect_ratio = _random_aspect_ratio(1.0, 0.3)
+        aspect_ratio = _random_aspect_ratio(rng, 1.0, 0.3)
         height = (area / aspect_ratio) ** 0.5
         width = aspect_ratio * height
         room_index[r_type] = room_index.get(r_type, 0) + 1
         room_name = f"{r_type}_{room_index[r_type]}"
         
-        poly = _try_place_with_soft_constraints(r_type, width, height, layouts, adjacency_pairs)
+        poly = _try_place_with_soft_constraints(r_type, width, height, layouts, adjacency_pairs, floor_bbox, placed_polys, placed_bounds[:len(placed_polys)], by_type, rng)
 
         # Balcony prefers living or bedroom
         if not poly and r_type == "balcony":
-            targets = [name for name in layouts.keys() if name.startswith("living") or name.startswith("bedroom")]
+            targets = by_type["living"] + by_type["bedroom"]
             for target in targets:
-                poly = _place_adjacent(layouts[target], width, height, layouts.values())
+                poly = _place_adjacent(layouts[target], width, height, placed_polys, existing_bounds=placed_bounds[:len(placed_polys)])
                 if poly:
                     break
         elif not poly:
-            poly = _place_adjacent(core_poly, width, height, layouts.values())
+            poly = _place_adjacent(core_poly, width, height, placed_polys, existing_bounds=placed_bounds[:len(placed_polys)])
         
         if poly:
             layouts[room_name] = poly
-            print(f"  📦 OTHER: {room_name}")
+            _record_placement(placed_polys, placed_bounds, floor_bbox, poly)
+            by_type[r_type].append(room_name)
+            _log(f"  📦 OTHER: {room_name}")
     
     # PHASE 6: FINAL RETRY (Desperation pass for any unplaced rooms)
     # Check what's missing
@@ -660,12 +768,14 @@ def synthesize_single_floor(spec, config=None):
             
             # Try any existing room as anchor
             all_targets = list(layouts.keys())
-            random.shuffle(all_targets)
+            rng.shuffle(all_targets)
             for target in all_targets:
-                poly = _place_adjacent(layouts[target], w, h, layouts.values())
+                poly = _place_adjacent(layouts[target], w, h, placed_polys, existing_bounds=placed_bounds[:len(placed_polys)])
                 if poly:
                     layouts[name] = poly
-                    print(f"  🩹 RECOVERED: {name} (Phase 6)")
+                    _record_placement(placed_polys, placed_bounds, floor_bbox, poly)
+                    by_type[t].append(name)
+                    _log(f"  🩹 RECOVERED: {name} (Phase 6)")
                     break
 
     return layouts
@@ -717,9 +827,24 @@ def _validate_room_counts(spec, placed_rooms):
 
     return is_valid
 
+def _candidate_room_pairs(polys):
+    """
+    Index pairs (i, j), i < j, of polygons that intersect (touching included),
+    found with one bulk STRtree query; sorted so iteration order matches a
+    plain nested loop over the rooms.
+    """
+    if len(polys) < 2:
+        return []
+    tree = shapely.STRtree(polys)
+    left, right = tree.query(polys, predicate="intersects")
+    keep = left < right
+    return sorted(zip(left[keep].tolist(), right[keep].tolist()))
+
 def synthesize_layout_from_spec(spec, config=None):
-    cfg = {**DEFAULT_CONFIG, **(config or {})}
-    rooms = synthesize_single_floor(spec, config)
+    cfg = DEFAULT_CONFIG | (config or {})
+    _log = _progress_printer(cfg)
+    rng = np.random.default_rng(cfg.get("RANDOM_SEED"))
+    rooms = synthesize_single_floor(spec, config, rng)
     
     # Soft validation: log whether all rooms were placed, but never abort.
     # A partial layout (e.g. hallway couldn't be placed) still gets scored
@@ -729,31 +854,39 @@ def synthesize_layout_from_spec(spec, config=None):
     if not is_valid:
         logger.warning("Proceeding with partial layout — one or more rooms could not be placed.")
     
-    adjacency_set = set()
     room_names = list(rooms.keys())
     
-    print("\n🔍 Detecting geometric adjacencies:")
-    for i, r1 in enumerate(room_names):
-        for r2 in room_names[i+1:]:
-            poly1 = rooms[r1]
-            poly2 = rooms[r2]
-            intersection = poly1.boundary.intersection(poly2.boundary)
-            if not intersection.is_empty and intersection.length > WALL_TOLERANCE:
-                pair = tuple(sorted([r1, r2]))
-                adjacency_set.add(pair)
-                print(f"  ✅ Geometric: {r1} ↔ {r2}")
-    
+    _log("\n🔍 Detecting geometric adjacencies:")
+    # Boundaries are built once per floor plan and shared by adjacency
+    # detection and the entrance door
+    geoms = np.asarray(list(rooms.values()), dtype=object)
+    boundaries = shapely.boundary(geoms)
+    room_boundaries = dict(zip(room_names, boundaries))
+    # Room type of every name ("bedroom_2" -> "bedroom"), split once here
+    room_types = {name: name.split("_", 1)[0] for name in room_names}
+
+    # One pass over the room pairs: geometric contact, the architectural
+    # rule check and the opening width. Only pairs that actually intersect
+    # (STRtree prefilter, each pair once) can share a wall; their
+    # shared-boundary lengths come from one vectorized call
+    geometric_adjacency = []
     valid_adjacency = []
-    print("\n🛡️  Applying architectural rules:")
-    for r1, r2 in adjacency_set:
-        t1 = r1.split("_")[0]
-        t2 = r2.split("_")[0]
-        is_valid, reason = validate_adjacency(t1, t2)
-        if is_valid:
-            valid_adjacency.append((r1, r2))
-            print(f"  ✅ Allowed: {r1} ↔ {r2} ({reason})")
-        else:
-            print(f"  ❌ Rejected: {r1} ↔ {r2} ({reason})")
+    opening_specs = []
+    pairs = _candidate_room_pairs(geoms)
+    if pairs:
+        a, b = np.asarray(pairs).T
+        shared = shapely.length(shapely.intersection(boundaries[a], boundaries[b]))
+        for i, j in np.asarray(pairs)[shared > WALL_TOLERANCE].tolist():
+            r1, r2 = sorted((room_names[i], room_names[j]))
+            t1, t2 = room_types[r1], room_types[r2]
+            geometric_adjacency.append((r1, r2))
+            is_valid, reason = validate_adjacency(t1, t2)
+            if is_valid:
+                valid_adjacency.append((r1, r2))
+                opening_specs.append((r1, r2, _determine_opening_width(t1, t2)))
+                _log(f"  ✅ Allowed: {r1} ↔ {r2} ({reason})")
+            else:
+                _log(f"  ❌ Rejected: {r1} ↔ {r2} ({reason})")
     
     corridors = None
     if valid_adjacency:
@@ -762,19 +895,17 @@ def synthesize_layout_from_spec(spec, config=None):
         except Exception as e:
             print(f"⚠️  Corridor: {e}")
     
-    doors = None
+    # Door polygons are collected in a list (entrance included) and
+    # unioned once at the end
+    door_polys = []
     if valid_adjacency:
         try:
-            opening_specs = []
-            for r1, r2 in valid_adjacency:
-                width = _determine_opening_width(r1, r2)
-                opening_specs.append((r1, r2, width))
-            doors = generate_doors(rooms, opening_specs)
-            if doors:
-                print(f"\n🚪 Generated {len(opening_specs)} openings")
+            door_polys = generate_door_polygons(rooms, opening_specs)
+            if door_polys:
+                _log(f"\n🚪 Generated {len(opening_specs)} openings")
                 for (a, b, w) in opening_specs:
                     style = "open space" if w == OPEN_SPACE_WIDTH else "door"
-                    print(f"   • {a} ↔ {b} ({style}, {w}m)")
+                    _log(f"   • {a} ↔ {b} ({style}, {w}m)")
         except Exception as e:
             print(f"⚠️  Doors: {e}")
             import traceback
@@ -783,13 +914,16 @@ def synthesize_layout_from_spec(spec, config=None):
     living_rooms = [name for name in rooms.keys() if name.startswith("living")]
     entrance = None
     if living_rooms:
-        print("\n🚪 Placing entrance on true external wall:")
-        entrance = _generate_entrance_door(rooms[living_rooms[0]], rooms)
+        _log("\n🚪 Placing entrance on true external wall:")
+        entrance = _generate_entrance_door(
+            rooms[living_rooms[0]], rooms, room_boundaries, living_name=living_rooms[0], rng=rng
+        )
         if entrance:
-            doors = unary_union([doors, entrance]) if doors else entrance
-            print("  ✅ Entrance door placed")
+            door_polys.append(entrance)
+            _log("  ✅ Entrance door placed")
         else:
-            print("  ⚠️  Failed to place entrance door")
+            _log("  ⚠️  Failed to place entrance door")
+    doors = unary_union(door_polys) if door_polys else None
     
     # Calculate Score
     # Base score 100
@@ -797,7 +931,7 @@ def synthesize_layout_from_spec(spec, config=None):
     # Penalty for missing entrance
     
     score = 100
-    total_adj = len(adjacency_set)
+    total_adj = len(geometric_adjacency)
     valid_adj = len(valid_adjacency)
     
     if total_adj > 0:
@@ -815,9 +949,8 @@ def synthesize_layout_from_spec(spec, config=None):
         if not isinstance(pair, (list, tuple)) or len(pair) != 2:
             continue
         t_a, t_b = pair[0], pair[1]
-        for r1, r2 in adjacency_set:
-            base1, base2 = r1.split("_")[0], r2.split("_")[0]
-            if {base1, base2} == {t_a, t_b}:
+        for r1, r2 in geometric_adjacency:
+            if {room_types[r1], room_types[r2]} == {t_a, t_b}:
                 satisfied += 1
                 break
 
@@ -6,52 +6,116 @@ import sys
 import random
 import os
 import csv
+import atexit
+import traceback
+from collections import defaultdict
+import numpy as np
+import shapely
+
+# CSV files kept open for the life of the process: {csv_path: (file, writer)}
+_CSV_STATE = {}
+
+
+def _close_csv_files():
+    for fh, _ in _CSV_STATE.values():
+        fh.close()
+    _CSV_STATE.clear()
+
+
+atexit.register(_close_csv_files)
+
+
+def _csv_writer(csv_path, fieldnames):
+    """Buffered DictWriter for csv_path, opened (and headed) once per process."""
+    state = _CSV_STATE.get(csv_path)
+    if state is None:
+        fh = open(csv_path, "a", newline="", buffering=1 << 20)
+        writer = csv.DictWriter(fh, fieldnames=fieldnames)
+        if os.path.getsize(csv_path) == 0:
+            writer.writeheader()
+        state = _CSV_STATE[csv_path] = (fh, writer)
+    return state[1]
+
+
+def _export_layout_rows_to_csv(csv_path, rows):
+    """Append pre-built feature rows (see _layout_csv_row) to csv_path in one write."""
+    if rows:
+        _csv_writer(csv_path, list(rows[0])).writerows(rows)
+
+
+def _hop_distances(adj):
+    """
+    All-pairs hop counts for a boolean adjacency matrix (-1 where unreachable).
+
+    Runs a BFS from every node at once: each hop expands all frontiers with
+    one boolean matrix product, so the loop runs diameter + 1 times.
+    """
+    n = len(adj)
+    dist = np.full((n, n), -1, dtype=int)
+    np.fill_diagonal(dist, 0)
+    reached = np.eye(n, dtype=bool)
+    frontier = reached
+    hops = 0
+    while frontier.any():
+        hops += 1
+        frontier = (frontier @ adj) & ~reached
+        reached |= frontier
+        dist[frontier] = hops
+    return dist
+
+
+def _first_two(values):
+    """First and second entries of values, 0.0 where missing."""
+    padded = values[:2] + [0.0, 0.0]
+    return padded[0], padded[1]
+
 
 def _export_layout_to_csv(csv_path, spec, layout, total_area, image_filename):
     """Export a rich feature row for the generated layout to CSV."""
+    _export_layout_rows_to_csv(csv_path, [_layout_csv_row(spec, layout, total_area, image_filename)])
+
+
+def _layout_csv_row(spec, layout, total_area, image_filename):
+    """Rich feature row (column name -> value) for the generated layout."""
 
     rooms_spec = spec.get("rooms", [])
     rooms_geom = layout.get("rooms", {})
     adjacency = layout.get("adjacency", [])
     doors_geom = layout.get("doors")
 
-    # Room counts / presence flags from spec
-    n_bedrooms = sum(1 for r in rooms_spec if r["type"] == "bedroom")
-    n_bathrooms = sum(1 for r in rooms_spec if r["type"] == "bathroom")
-    has_kitchen = int(any(r["type"] == "kitchen" for r in rooms_spec))
-    has_dining = int(any(r["type"] == "dining" for r in rooms_spec))
-    has_balcony = int(any(r["type"] == "balcony" for r in rooms_spec))
-    has_study = int(any(r["type"] == "study" for r in rooms_spec))
-    has_store = int(any(r["type"] in ("storage", "store") for r in rooms_spec))
-
-    # Helper to get first/second instance area for a room type
-    def _areas_for_type(t):
-        vals = [r["area"] for r in rooms_spec if r["type"] == t]
-        vals += [0.0, 0.0]  # pad
-        return vals[0], vals[1]
-
-    living_area, _ = _areas_for_type("living")
-    bedroom1_area, bedroom2_area = _areas_for_type("bedroom")
-    kitchen_area, _ = _areas_for_type("kitchen")
-    bathroom1_area, bathroom2_area = _areas_for_type("bathroom")
-    balcony_area, _ = _areas_for_type("balcony")
-
-    # Adjacency flags from layout adjacency list
-    def _has_adj(type_a, type_b):
-        wanted = {type_a, type_b}
-        for r1, r2 in adjacency:
-            t1 = r1.split("_")[0]
-            t2 = r2.split("_")[0]
-            if {t1, t2} == wanted:
-                return 1
-        return 0
-
-    adj_living_bedroom = _has_adj("living", "bedroom")
-    adj_living_kitchen = _has_adj("living", "kitchen")
-    adj_living_bathroom = _has_adj("living", "bathroom")
-    adj_bedroom_bathroom = _has_adj("bedroom", "bathroom")
-    adj_kitchen_dining = _has_adj("kitchen", "dining")
-    adj_living_balcony = _has_adj("living", "balcony")
+    # Spec room areas bucketed by type in one pass; counts, presence flags
+    # and first/second instance areas all come from these buckets
+    areas_by_type = defaultdict(list)
+    for r in rooms_spec:
+        areas_by_type[r["type"]].append(r["area"])
+
+    n_bedrooms = len(areas_by_type["bedroom"])
+    n_bathrooms = len(areas_by_type["bathroom"])
+    has_kitchen = int(bool(areas_by_type["kitchen"]))
+    has_dining = int(bool(areas_by_type["dining"]))
+    has_balcony = int(bool(areas_by_type["balcony"]))
+    has_study = int(bool(areas_by_type["study"]))
+    has_store = int(bool(areas_by_type["storage"] or areas_by_type["store"]))
+
+    living_area, _ = _first_two(areas_by_type["living"])
+    bedroom1_area, bedroom2_area = _first_two(areas_by_type["bedroom"])
+    kitchen_area, _ = _first_two(areas_by_type["kitchen"])
+    bathroom1_area, bathroom2_area = _first_two(areas_by_type["bathroom"])
+    balcony_area, _ = _first_two(areas_by_type["balcony"])
+
+    # Adjacency flags from layout adjacency list: the room-type pairs are
+    # collected once, then each flag is a set lookup
+    type_pairs = {
+        frozenset((r1.split("_", 1)[0], r2.split("_", 1)[0]))
+        for r1, r2 in adjacency
+    }
+
+    adj_living_bedroom = int(frozenset(("living", "bedroom")) in type_pairs)
+    adj_living_kitchen = int(frozenset(("living", "kitchen")) in type_pairs)
+    adj_living_bathroom = int(frozenset(("living", "bathroom")) in type_pairs)
+    adj_bedroom_bathroom = int(frozenset(("bedroom", "bathroom")) in type_pairs)
+    adj_kitchen_dining = int(frozenset(("kitchen", "dining")) in type_pairs)
+    adj_living_balcony = int(frozenset(("living", "balcony")) in type_pairs)
 
     # Bedroom1 geometry (if present)
     b1_poly = rooms_geom.get("bedroom_1")
@@ -67,61 +131,45 @@ def _export_layout_to_csv(csv_path, spec, layout, total_area, image_filename):
 
     # Graph metrics on room adjacency graph
     nodes = list(rooms_geom.keys())
-    neighbors = {n: set() for n in nodes}
+    index = {n: i for i, n in enumerate(nodes)}
+    adj = np.zeros((len(nodes), len(nodes)), dtype=bool)
     for r1, r2 in adjacency:
-        if r1 in neighbors and r2 in neighbors:
-            neighbors[r1].add(r2)
-            neighbors[r2].add(r1)
-
-    # BFS distances between all pairs
-    def _bfs(start):
-        from collections import deque
-        dist = {start: 0}
-        dq = deque([start])
-        while dq:
-            u = dq.popleft()
-            for v in neighbors[u]:
-                if v not in dist:
-                    dist[v] = dist[u] + 1
-                    dq.append(v)
-        return dist
-
-    all_dists = []
-    for n in nodes:
-        d = _bfs(n)
-        for m, val in d.items():
-            if m != n:
-                all_dists.append(val)
-
-    if all_dists:
-        avg_path_length = sum(all_dists) / len(all_dists)
-        max_path_length = max(all_dists)
+        if r1 in index and r2 in index:
+            adj[index[r1], index[r2]] = adj[index[r2], index[r1]] = True
+
+    # Hop distances between all reachable pairs
+    dist = _hop_distances(adj)
+    all_dists = dist[dist > 0]
+
+    if all_dists.size:
+        avg_path_length = float(all_dists.mean())
+        max_path_length = int(all_dists.max())
     else:
         avg_path_length = 0.0
         max_path_length = 0.0
 
-    dead_end_count = sum(1 for n in nodes if len(neighbors[n]) == 1)
+    dead_end_count = int((adj.sum(axis=1) == 1).sum())
 
     # Wall / door statistics
     wall_segments = get_wall_segments(rooms_geom) if rooms_geom else []
-    total_walls = float(len(wall_segments)) if wall_segments else 1.0
+    total_walls = float(len(wall_segments)) if len(wall_segments) else 1.0
 
     if doors_geom is None or doors_geom.is_empty:
         door_count = 0
     else:
         if hasattr(doors_geom, "geoms"):
-            door_count = len(list(doors_geom.geoms))
+            door_count = len(doors_geom.geoms)
         else:
             door_count = 1
 
     openness_ratio = door_count / total_walls
 
     # Exterior wall ratio: perimeter / area of all rooms combined
-    total_area_geom = 0.0
-    total_perimeter = 0.0
-    for poly in rooms_geom.values():
-        total_area_geom += poly.area
-        total_perimeter += poly.length
+    # (areas and perimeters from one vectorized call each; summed in room
+    # order like the running totals they replace)
+    geoms = np.fromiter(rooms_geom.values(), dtype=object, count=len(rooms_geom))
+    total_area_geom = sum(shapely.area(geoms).tolist(), 0.0)
+    total_perimeter = sum(shapely.length(geoms).tolist(), 0.0)
     exterior_wall_ratio = (total_perimeter / total_area_geom) if total_area_geom > 0 else 0.0
 
     # High-level labels / priorities (placeholders for now)
@@ -137,8 +185,7 @@ def _export_layout_to_csv(csv_path, spec, layout, total_area, image_filename):
     circulation_score = 0.0
     efficiency_score = 0.0
 
-    # Build CSV row
-    row = {
+    return {
         "image_file": image_filename,
         "total_area": float(total_area) if total_area is not None else 0.0,
         "n_bedrooms": n_bedrooms,
@@ -184,15 +231,6 @@ def _export_layout_to_csv(csv_path, spec, layout, total_area, image_filename):
         "efficiency_score": efficiency_score,
     }
 
-    fieldnames = list(row.keys())
-    file_exists = os.path.exists(csv_path)
-
-    with open(csv_path, "a", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        if not file_exists or f.tell() == 0:
-            writer.writeheader()
-        writer.writerow(row)
-
 
 def main():
     print("\n" + "="*70)
@@ -273,7 +311,6 @@ def main():
         layout = synthesize_layout_from_spec(spec, {"RANDOM_SEED": random_seed})
     except Exception as e:
         print(f"❌ Layout synthesis failed: {e}")
-        import traceback
         traceback.print_exc()
         return
 
@@ -322,7 +359,6 @@ def main():
         build_house_from_layout(layout)
     except Exception as e:
         print(f"❌ 3D generation failed: {e}")
-        import traceback
         traceback.print_exc()
         return
     
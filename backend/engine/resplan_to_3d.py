@@ -1,9 +1,13 @@
 
 import numpy as np
+from numba import njit, prange
+import shapely
 from shapely.geometry import Polygon, MultiPolygon, LineString, box, Point
 from shapely.ops import unary_union
 from shapely.affinity import rotate
 from collections import defaultdict
+from functools import lru_cache
+from itertools import groupby
 import open3d as o3d
 import os
 
@@ -35,27 +39,23 @@ ROOM_COLORS = [
     "#9D8189",  # Muted Mauve
 ]
 
-def _extrude_linestring_to_thin_wall(line, z_bottom, z_top):
-    """Extrude a LineString into a thin *thickened* wall strip."""
-    if line.is_empty or line.length < 0.01:
-        return []
-
-    coords = list(line.coords)
-    if len(coords) < 2:
-        return []
-
-    faces = []
-    half_t = WALL_THICKNESS / 2.0
-
-    for i in range(len(coords) - 1):
-        x1, y1 = coords[i]
-        x2, y2 = coords[i + 1]
+@njit(cache=True, fastmath=True, parallel=True)
+def _wall_quads_batch(segs, z_tops, z_bottom, half_t):
+    """
+    Quads of thickened wall strips, one strip per straight segment.
 
+    segs is a (K, 2, 2) array of segment endpoints (non-zero length) and
+    z_tops the (K,) wall top heights. Returns a (K, 5, 4, 3) array: outer,
+    inner, start cap, end cap and top face per segment.
+    """
+    quads = np.empty((segs.shape[0], 5, 4, 3))
+    for i in prange(segs.shape[0]):
+        x1, y1 = segs[i, 0, 0], segs[i, 0, 1]
+        x2, y2 = segs[i, 1, 0], segs[i, 1, 1]
+        z_top = z_tops[i]
         dx = x2 - x1
         dy = y2 - y1
         length = (dx * dx + dy * dy) ** 0.5
-        if length < 1e-4:
-            continue
 
         # Unit perpendicular vector
         nx = -dy / length
@@ -67,52 +67,20 @@ def _extrude_linestring_to_thin_wall(line, z_bottom, z_top):
         x1_out, y1_out = x1 - nx * half_t, y1 - ny * half_t
         x2_out, y2_out = x2 - nx * half_t, y2 - ny * half_t
 
-        # Outer face
-        face_outer = [
-            [x1_out, y1_out, z_bottom],
-            [x2_out, y2_out, z_bottom],
-            [x2_out, y2_out, z_top],
-            [x1_out, y1_out, z_top],
-        ]
-        faces.append(face_outer)
-
-        # Inner face
-        face_inner = [
-            [x2_in, y2_in, z_bottom],
-            [x1_in, y1_in, z_bottom],
-            [x1_in, y1_in, z_top],
-            [x2_in, y2_in, z_top],
-        ]
-        faces.append(face_inner)
-
-        # Start Cap (only if needed, but for closed loops usually not, however 
-        # since we split by doors, we have open ends. Let's close them for solidity)
-        face_start = [
-             [x1_out, y1_out, z_bottom],
-             [x1_in, y1_in, z_bottom],
-             [x1_in, y1_in, z_top],
-             [x1_out, y1_out, z_top]
-        ]
-        faces.append(face_start)
-        
-        face_end = [
-             [x2_in, y2_in, z_bottom],
-             [x2_out, y2_out, z_bottom],
-             [x2_out, y2_out, z_top],
-             [x2_in, y2_in, z_top]
-        ]
-        faces.append(face_end)
-        
-        # Top cap
-        face_top = [
-            [x1_out, y1_out, z_top],
-            [x2_out, y2_out, z_top],
-            [x2_in, y2_in, z_top],
-            [x1_in, y1_in, z_top]
-        ]
-        faces.append(face_top)
-
-    return faces
+        # (x, y, z) corners of the 5 faces: outer, inner, start cap, end cap, top
+        faces = (
+            ((x1_out, y1_out, z_bottom), (x2_out, y2_out, z_bottom), (x2_out, y2_out, z_top), (x1_out, y1_out, z_top)),
+            ((x2_in, y2_in, z_bottom), (x1_in, y1_in, z_bottom), (x1_in, y1_in, z_top), (x2_in, y2_in, z_top)),
+            ((x1_out, y1_out, z_bottom), (x1_in, y1_in, z_bottom), (x1_in, y1_in, z_top), (x1_out, y1_out, z_top)),
+            ((x2_in, y2_in, z_bottom), (x2_out, y2_out, z_bottom), (x2_out, y2_out, z_top), (x2_in, y2_in, z_top)),
+            ((x1_out, y1_out, z_top), (x2_out, y2_out, z_top), (x2_in, y2_in, z_top), (x1_in, y1_in, z_top)),
+        )
+        for f in range(5):
+            for c in range(4):
+                quads[i, f, c, 0] = faces[f][c][0]
+                quads[i, f, c, 1] = faces[f][c][1]
+                quads[i, f, c, 2] = faces[f][c][2]
+    return quads
 
 
 def _extrude_polygon_vertical_shell(poly, z_bottom, z_top, thickness=0.05):
@@ -156,55 +124,48 @@ def _extrude_polygon_vertical_shell(poly, z_bottom, z_top, thickness=0.05):
 
 
 def _extrude_polygon_to_3d(poly, z_bottom, z_top):
-    """Extrude 2D polygon to 3D prism (Floors)."""
+    """
+    Extrude 2D polygon to 3D prism (Floors).
+
+    Returns the faces as a list: one (4, 3) quad per side, then the top and
+    bottom (n, 3) caps.
+    """
     if poly.is_empty or not hasattr(poly, 'exterior'): return []
-    coords = list(poly.exterior.coords)
-    if len(coords) < 3: return []
-    if coords[0] != coords[-1]: coords.append(coords[0])
+    c = np.asarray(poly.exterior.coords, dtype=np.float64)
+    if len(c) < 3: return []
+    if not np.array_equal(c[0], c[-1]): c = np.vstack([c, c[:1]])
     
-    faces = []
-    # Vertical faces
-    for i in range(len(coords) - 1):
-        x1, y1 = coords[i]
-        x2, y2 = coords[i + 1]
-        face = [
-            [x1, y1, z_bottom],
-            [x2, y2, z_bottom],
-            [x2, y2, z_top],
-            [x1, y1, z_top]
-        ]
-        faces.append(face)
+    # Vertical faces: (p1, zb), (p2, zb), (p2, zt), (p1, zt) per edge
+    p1, p2 = c[:-1], c[1:]
+    zb = np.full((len(p1), 1), float(z_bottom))
+    zt = np.full((len(p1), 1), float(z_top))
+    quads = np.stack([np.hstack([p1, zb]), np.hstack([p2, zb]), np.hstack([p2, zt]), np.hstack([p1, zt])], axis=1)
     
     # Top/Bottom
-    faces.append([[x, y, z_top] for x, y in coords[:-1]])
-    faces.append([[x, y, z_bottom] for x, y in reversed(coords[:-1])])
+    top = np.hstack([p1, zt])
+    bottom = np.hstack([p1, zb])[::-1]
     
-    return faces
+    return [*quads, top, bottom]
 
 
 def _normalize_orientation(rooms, doors):
     """Rotate rooms and doors to align with X-axis."""
     if not rooms: return rooms, doors
     
-    all_coords = []
-    for poly in rooms.values():
-        if not poly.is_empty:
-            all_coords.extend(list(poly.exterior.coords))
-            
-    if len(all_coords) < 2: return rooms, doors
+    parts = [np.asarray(poly.exterior.coords, dtype=np.float64) for poly in rooms.values() if not poly.is_empty]
+    if not parts: return rooms, doors
+    coords = np.concatenate(parts)
+    if len(coords) < 2: return rooms, doors
     
-    xs = np.array([c[0] for c in all_coords])
-    ys = np.array([c[1] for c in all_coords])
+    x_mean, y_mean = coords.mean(axis=0)
     
-    x_mean = xs.mean()
-    y_mean = ys.mean()
-    
-    # PCI for rotation
-    X = np.vstack((xs - x_mean, ys - y_mean))
-    cov = np.cov(X)
-    eigvals, eigvecs = np.linalg.eig(cov)
-    idx = np.argmax(eigvals)
-    vx, vy = eigvecs[:, idx]
+    # PCI for rotation (covariance is symmetric, so eigh)
+    cov = np.cov(coords.T)
+    eigvals, eigvecs = np.linalg.eigh(cov)
+    vx, vy = eigvecs[:, np.argmax(eigvals)]
+    if vx < 0:
+        # Eigenvector sign is arbitrary; pick the one needing < 90 deg of rotation
+        vx, vy = -vx, -vy
     angle_deg = np.degrees(np.arctan2(vy, vx))
     
     origin = (x_mean, y_mean)
@@ -218,12 +179,82 @@ def _normalize_orientation(rooms, doors):
     return rotated_rooms, rotated_doors
 
 
+@lru_cache(maxsize=64)
 def _hex_to_rgb01(hex_color):
+    """'#RRGGBB' -> (r, g, b) in 0..1; cached, the palette is a few dozen colours"""
     hex_color = hex_color.lstrip("#")
     return tuple(int(hex_color[i:i+2], 16) / 255.0 for i in (0, 2, 4))
 
 
+@lru_cache(maxsize=None)
+def _fan_triangles(k):
+    """(k - 2, 3) int32 fan triangulation [0, i, i + 1] of a k-gon (shared, read-only)"""
+    fan = np.empty((k - 2, 3), dtype=np.int32)
+    fan[:, 0] = 0
+    fan[:, 1] = np.arange(1, k - 1)
+    fan[:, 2] = np.arange(2, k)
+    fan.flags.writeable = False
+    return fan
+
+
+class _FaceBuffer:
+    """
+    Mesh accumulator kept as struct-of-arrays: vertex, colour and triangle
+    chunks are appended per batch of faces and concatenated once in
+    arrays(), instead of keeping a dict per face. Chunks are staged as
+    float32 (ample for metre-scale geometry and 8-bit colours) and only
+    widened to the float64 Open3D wants at the end.
+    """
+
+    def __init__(self):
+        self._vertices = []
+        self._colors = []
+        self._triangles = []
+        self._count = 0
+
+    def add(self, faces, color):
+        """
+        Append faces (sequence of K-gons, each K x 3 vertices) in one colour,
+        fan-triangulated. Faces with fewer than 3 vertices are skipped.
+        """
+        if isinstance(faces, np.ndarray) and faces.ndim == 3:
+            # Uniform (n_faces, K, 3) batch: no per-face filtering needed
+            if not len(faces) or faces.shape[1] < 3:
+                return
+        else:
+            faces = [f for f in faces if len(f) >= 3]
+            if not faces:
+                return
+            if any(len(f) != len(faces[0]) for f in faces):
+                # Mixed face sizes (e.g. prism sides + n-gon caps): one batch
+                # per run of equal-size faces, in order
+                for _, run in groupby(faces, key=len):
+                    self.add(list(run), color)
+                return
+
+        k = len(faces[0])
+        verts = np.asarray(faces, dtype=np.float32).reshape(-1, 3)
+        n_faces = len(faces)
+        starts = self._count + k * np.arange(n_faces, dtype=np.int32)
+        self._vertices.append(verts)
+        self._colors.append(np.broadcast_to(np.asarray(_hex_to_rgb01(color), dtype=np.float32), verts.shape))
+        self._triangles.append((starts[:, None, None] + _fan_triangles(k)).reshape(-1, 3))
+        self._count += len(verts)
+
+    def __len__(self):
+        return self._count
+
+    def arrays(self):
+        """(vertices (N, 3) float64, triangles (M, 3) int32, colors (N, 3) float64)"""
+        return (
+            np.concatenate(self._vertices).astype(np.float64),
+            np.concatenate(self._triangles),
+            np.concatenate(self._colors).astype(np.float64),
+        )
+
+
 def add_box_to_faces(all_faces, x1, x2, y1, y2, z1, z2, color, alpha=1.0):
+    """Append an axis-aligned box to the _FaceBuffer all_faces (alpha is unused: mesh colours are RGB)."""
     # Corners
     c000 = [x1, y1, z1]
     c100 = [x2, y1, z1]
@@ -234,19 +265,15 @@ def add_box_to_faces(all_faces, x1, x2, y1, y2, z1, z2, color, alpha=1.0):
     c111 = [x2, y2, z2]
     c011 = [x1, y2, z2]
     
-    # 6 Faces
-    # Bottom
-    all_faces.append({"vertices": [c000, c010, c110, c100], "color": color, "alpha": alpha})
-    # Top
-    all_faces.append({"vertices": [c001, c101, c111, c011], "color": color, "alpha": alpha})
-    # Front
-    all_faces.append({"vertices": [c000, c100, c101, c001], "color": color, "alpha": alpha})
-    # Back
-    all_faces.append({"vertices": [c110, c010, c011, c111], "color": color, "alpha": alpha})
-    # Left
-    all_faces.append({"vertices": [c010, c000, c001, c011], "color": color, "alpha": alpha})
-    # Right
-    all_faces.append({"vertices": [c100, c110, c111, c101], "color": color, "alpha": alpha})
+    # 6 Faces: bottom, top, front, back, left, right
+    all_faces.add([
+        [c000, c010, c110, c100],
+        [c001, c101, c111, c011],
+        [c000, c100, c101, c001],
+        [c110, c010, c011, c111],
+        [c010, c000, c001, c011],
+        [c100, c110, c111, c101],
+    ], color)
 
 
 def _place_room_furniture(all_faces, name, poly, door_polys=None):
@@ -307,8 +334,9 @@ def _place_room_furniture(all_faces, name, poly, door_polys=None):
         # Check where the door is
         door_near_top = False
         if door_polys:
+            room_zone = poly.buffer(0.1)
             for door in door_polys:
-                if door.intersects(poly.buffer(0.1)):
+                if door.intersects(room_zone):
                     dy = door.centroid.y
                     if abs(dy - maxy) < abs(dy - miny):
                         door_near_top = True
@@ -344,8 +372,9 @@ def _place_room_furniture(all_faces, name, poly, door_polys=None):
         # Check if there is a door near the top wall (maxy) or bottom wall (miny)
         door_near_bottom = False
         if door_polys:
+            room_zone = poly.buffer(0.1)
             for door in door_polys:
-                if door.intersects(poly.buffer(0.1)):
+                if door.intersects(room_zone):
                     dy = door.centroid.y
                     if abs(dy - miny) < abs(dy - maxy):
                         door_near_bottom = True
@@ -395,25 +424,69 @@ def _compute_wall_graph(rooms):
         edges: dict mapping (p1, p2) -> list of room_names sharing this edge
     """
     edge_to_rooms = defaultdict(list)
-    
+
+    # Every room edge as an (x1, y1, x2, y2) row, tagged with its room
+    segments = []
+    owners = []
     for room_name, poly in rooms.items():
         if poly.is_empty: continue
-        coords = list(poly.exterior.coords)
-        for i in range(len(coords) - 1):
-            p1 = coords[i]
-            p2 = coords[i+1]
-            
-            # Canonicalize edge key (sort points)
-            if p1 > p2:
-                key = (p2, p1)
-            else:
-                key = (p1, p2)
-                
-            edge_to_rooms[key].append(room_name)
-            
+        coords = np.asarray(poly.exterior.coords)
+        segments.append(np.hstack((coords[:-1], coords[1:])))
+        owners.extend([room_name] * (len(coords) - 1))
+    if not segments:
+        return edge_to_rooms
+    segments = np.concatenate(segments)
+
+    # Canonicalize edge key (sort points): swap rows whose first endpoint
+    # is lexicographically greater, then group identical edges
+    x1, y1, x2, y2 = segments.T
+    swap = (x1 > x2) | ((x1 == x2) & (y1 > y2))
+    canon = np.where(swap[:, None], segments[:, [2, 3, 0, 1]], segments)
+    edges, first, inverse = np.unique(canon, axis=0, return_index=True, return_inverse=True)
+
+    # Keys in first-seen order, rooms in input order within each key
+    keys = [((a, b), (c, d)) for a, b, c, d in edges.tolist()]
+    for e in np.argsort(first, kind="stable").tolist():
+        edge_to_rooms[keys[e]] = []
+    for e, room_name in zip(inverse.ravel().tolist(), owners):
+        edge_to_rooms[keys[e]].append(room_name)
+
     return edge_to_rooms
 
 
+def _wall_aligned_door_panel(opening):
+    """Door panel footprint (flush with the wall centre) for an opening LineString, or None if narrower than a door."""
+    # Calculate Door Geometry aligned to Wall
+    i_coords = list(opening.coords)
+    if len(i_coords) < 2:
+        return None
+    ix1, iy1 = i_coords[0]
+    ix2, iy2 = i_coords[-1]
+    idx, idy = ix2 - ix1, iy2 - iy1
+    ilen = (idx**2 + idy**2)**0.5
+    if ilen <= 0.5: # Min door width
+        return None
+
+    # Vector logic
+    wall_dir = np.array([idx, idy]) / ilen
+    perp_dir = np.array([-wall_dir[1], wall_dir[0]])
+
+    center = np.array([(ix1+ix2)/2, (iy1+iy2)/2])
+
+    # Dimensions
+    d_thick = WALL_THICKNESS * 0.8 # Slightly thinner than wall
+    d_half_width = ilen / 2
+    d_half_thick = d_thick / 2
+
+    # Construct corners (flush with wall center)
+    c1 = center + wall_dir * d_half_width + perp_dir * d_half_thick
+    c2 = center - wall_dir * d_half_width + perp_dir * d_half_thick
+    c3 = center - wall_dir * d_half_width - perp_dir * d_half_thick
+    c4 = center + wall_dir * d_half_width - perp_dir * d_half_thick
+
+    return Polygon([tuple(c1), tuple(c2), tuple(c3), tuple(c4)])
+
+
 def build_house_from_layout(layout, visualize=True, output_file="house_3d_cad.ply"):
     """
     3D House Renderer - Wall-Centric CAD Logic
@@ -442,11 +515,12 @@ def build_house_from_layout(layout, visualize=True, output_file="house_3d_cad.pl
     # Snap angles to fix floating point drift
     def _snap_coords(poly):
          if not poly or poly.is_empty: return poly
-         new_coords = []
-         for x, y in poly.exterior.coords:
-             # Strongly snap to 0.1m grid (10cm) to enforce squareness
-             new_coords.append((round(x * 10) / 10.0, round(y * 10) / 10.0))
-         return Polygon(new_coords)
+         # Strongly snap to 0.1m grid (10cm) to enforce squareness
+         # (np.round rounds half to even, like round())
+         coords = np.asarray(poly.exterior.coords, dtype=np.float64) * 10
+         np.round(coords, out=coords)
+         coords /= 10.0
+         return Polygon(coords)
 
     rooms = {k: _snap_coords(v) for k, v in rooms.items()}
 
@@ -460,13 +534,13 @@ def build_house_from_layout(layout, visualize=True, output_file="house_3d_cad.pl
                  if isinstance(d, Polygon): door_polygons.append(d)
 
     # 2. Build Floor Geometry
-    all_faces = []
+    all_faces = _FaceBuffer()
     
     # Create Ground Plane (Context) - REMOVED per user request
     # ground_poly = box(-10, -10, 30, 30) 
     # ground_faces = _extrude_polygon_to_3d(ground_poly, -0.1, -0.01)
     # for face in ground_faces:
-    #     all_faces.append({"vertices": face, "color": GROUND_COLOR, "alpha": 1.0})
+    # all_faces.add(ground_faces, GROUND_COLOR)
 
     # Create Room Floors
     print(" Building floors...")
@@ -474,9 +548,7 @@ def build_house_from_layout(layout, visualize=True, output_file="house_3d_cad.pl
     for i, (name, poly) in enumerate(room_items):
         color = ROOM_COLORS[i % len(ROOM_COLORS)]
         # Floor 0 to THICKNESS
-        faces = _extrude_polygon_to_3d(poly, 0, FLOOR_THICKNESS)
-        for f in faces:
-            all_faces.append({"vertices": f, "color": color, "alpha": 0.9})
+        all_faces.add(_extrude_polygon_to_3d(poly, 0, FLOOR_THICKNESS), color)
             
         # Add 3D Furniture blocks
         _place_room_furniture(all_faces, name.lower(), poly, door_polygons)
@@ -486,36 +558,61 @@ def build_house_from_layout(layout, visualize=True, output_file="house_3d_cad.pl
     edge_to_rooms = _compute_wall_graph(rooms)
     
     # Parse Adjacency for Balcony Logic
+    # Lowercased names and the neighbour lists are built once, not per
+    # balcony per adjacency entry
     adj_list = layout.get("adjacency", [])
-    balcony_types = {} 
-    for r_name in rooms:
-        if "balcony" in r_name.lower() or "garden" in r_name.lower():
-            # Determine type
-            b_type = 'half' # Default
-            # Find neighbors
-            neighbors = []
-            for a, b in adj_list:
-                if a == r_name: neighbors.append(b)
-                elif b == r_name: neighbors.append(a)
-            for n in neighbors:
-                if "living" in n.lower() or "hall" in n.lower():
-                    b_type = 'open'
-            balcony_types[r_name] = b_type
+    lower_name = {r_name: r_name.lower() for r_name in rooms}
+    neighbors = defaultdict(list)
+    for a, b in adj_list:
+        neighbors[a].append(b)
+        neighbors[b].append(a)
+
+    balcony_types = {}
+    for r_name, low in lower_name.items():
+        if "balcony" in low or "garden" in low:
+            # 'open' next to a living/hall room, 'half' (default) otherwise
+            opens_to_living = any(
+                "living" in n.lower() or "hall" in n.lower()
+                for n in neighbors[r_name]
+            )
+            balcony_types[r_name] = 'open' if opens_to_living else 'half'
 
     # 4. Generate Wall Geometry (Cutting for Doors)
     print(" Generating walls...")
+
+    # Slight buffer vs line for intersection; buffered once for all doors
+    # instead of once per door per wall edge
+    door_shapes = list(shapely.buffer(np.asarray(door_polygons, dtype=object), 0.01)) if door_polygons else []
+    # Spatial index over the door buffers: each wall edge only visits the
+    # doors it actually crosses
+    door_tree = shapely.STRtree(door_shapes) if door_shapes else None
+    # All door buffers merged once, so each cut wall edge needs a single
+    # intersection and a single difference
+    doors_union = shapely.union_all(door_shapes) if door_shapes else None
     
     generated_door_panels = [] # New list for wall-aligned doors
+    # Surviving wall segments ((x1, y1), (x2, y2)) and their top heights,
+    # extruded in one batch
+    wall_segs = []
+    wall_tops = []
+
+    # Edges crossing a door, from one bulk tree query; every other edge
+    # goes straight to the extrusion kernel without building a LineString
+    edge_lines = None
+    cut_edges = set()
+    if door_tree is not None and edge_to_rooms:
+        edge_lines = shapely.linestrings(np.asarray(list(edge_to_rooms), dtype=np.float64))
+        cut_edges = set(door_tree.query(edge_lines, predicate="intersects")[0].tolist())
     
-    for (p1, p2), sharing_rooms in edge_to_rooms.items():
-        base_line = LineString([p1, p2])
-        if base_line.length < 0.1: continue
+    for i, ((p1, p2), sharing_rooms) in enumerate(edge_to_rooms.items()):
+        dx = p2[0] - p1[0]
+        dy = p2[1] - p1[1]
+        if dx * dx + dy * dy < 0.01: continue
         
         # Determine Wall Type
         is_exterior = (len(sharing_rooms) == 1)
         
         # Determine Height
-        z_bottom = FLOOR_THICKNESS
         z_top = FLOOR_THICKNESS + WALL_HEIGHT
         
         if is_exterior:
@@ -529,102 +626,62 @@ def build_house_from_layout(layout, visualize=True, output_file="house_3d_cad.pl
             # Interior Wall
             pass 
 
+        if i not in cut_edges:
+            wall_segs.append((p1, p2))
+            wall_tops.append(z_top)
+            continue
+
         # Cut Doors physically from this segment
         # We subtract all door polygons from this line
-        final_segments = [base_line]
-        
-        if door_polygons:
-            for door in door_polygons:
-                new_segments = []
-                door_shape = door.buffer(0.01) # Slight buffer vs line for intersection
-                
-                for seg in final_segments:
-                    if seg.intersects(door_shape):
-                        # 1. Capture the Hole (Intersection)
-                        intersection = seg.intersection(door_shape)
-                        
-                        # Generate Wall-Aligned Door Panel if valid intersection
-                        if not intersection.is_empty and isinstance(intersection, LineString):
-                             # Calculate Door Geometry aligned to Wall
-                             i_coords = list(intersection.coords)
-                             if len(i_coords) >= 2:
-                                 ix1, iy1 = i_coords[0]
-                                 ix2, iy2 = i_coords[-1]
-                                 idx, idy = ix2 - ix1, iy2 - iy1
-                                 ilen = (idx**2 + idy**2)**0.5
-                                 
-                                 if ilen > 0.5: # Min door width
-                                     # Vector logic
-                                     wall_dir = np.array([idx, idy]) / ilen
-                                     perp_dir = np.array([-wall_dir[1], wall_dir[0]])
-                                     
-                                     center = np.array([(ix1+ix2)/2, (iy1+iy2)/2])
-                                     
-                                     # Dimensions
-                                     d_thick = WALL_THICKNESS * 0.8 # Slightly thinner than wall
-                                     d_half_width = ilen / 2
-                                     d_half_thick = d_thick / 2
-                                     
-                                     # Construct corners (flush with wall center)
-                                     c1 = center + wall_dir * d_half_width + perp_dir * d_half_thick
-                                     c2 = center - wall_dir * d_half_width + perp_dir * d_half_thick
-                                     c3 = center - wall_dir * d_half_width - perp_dir * d_half_thick
-                                     c4 = center + wall_dir * d_half_width - perp_dir * d_half_thick
-                                     
-                                     door_poly = Polygon([tuple(c1), tuple(c2), tuple(c3), tuple(c4)])
-                                     generated_door_panels.append(door_poly)
-                        # 2. Subtract the Hole from Wall
-                        diff = seg.difference(door_shape)
-                        if not diff.is_empty:
-                            if isinstance(diff, LineString):
-                                new_segments.append(diff)
-                            elif hasattr(diff, "geoms"):
-                                new_segments.extend(diff.geoms)
-                    else:
-                        new_segments.append(seg)
-                final_segments = new_segments
+        base_line = edge_lines[i]
+
+        # 1. Capture the Holes (one intersection with all doors)
+        holes = base_line.intersection(doors_union)
+        for hole in getattr(holes, "geoms", [holes]):
+            if not hole.is_empty and isinstance(hole, LineString):
+                door_poly = _wall_aligned_door_panel(hole)
+                if door_poly is not None:
+                    generated_door_panels.append(door_poly)
+
+        # 2. Subtract the Holes from Wall (one difference)
+        diff = base_line.difference(doors_union)
+        final_segments = [g for g in getattr(diff, "geoms", [diff]) if not g.is_empty and isinstance(g, LineString)]
         
-        # Extrude resulting segments
+        # Queue resulting segments for extrusion
         for seg in final_segments:
             if seg.length < 0.05: continue
-            w_faces = _extrude_linestring_to_thin_wall(seg, z_bottom, z_top)
-            for f in w_faces:
-                all_faces.append({"vertices": f, "color": WALL_COLOR, "alpha": 1.0})
+            pts = list(seg.coords)
+            wall_segs.extend(zip(pts[:-1], pts[1:]))
+            wall_tops.extend([z_top] * (len(pts) - 1))
+
+    # Extrude every wall segment at once; start/end caps close the open
+    # ends left where walls are split by doors
+    if wall_segs:
+        segs = np.asarray(wall_segs, dtype=np.float64)
+        d = segs[:, 1] - segs[:, 0]
+        keep = np.hypot(d[:, 0], d[:, 1]) >= 1e-4
+        if keep.any():
+            z_tops = np.asarray(wall_tops, dtype=np.float64)[keep]
+            quads = _wall_quads_batch(np.ascontiguousarray(segs[keep]), z_tops, FLOOR_THICKNESS, WALL_THICKNESS / 2.0)
+            all_faces.add(quads.reshape(-1, 4, 3), WALL_COLOR)
 
     # 5. Generate Doors (Use Wall-Aligned Panels)
     print(" Generating doors...")
     for door in generated_door_panels:
         if door.is_empty: continue
         # Thinner panel
-        d_faces = _extrude_polygon_vertical_shell(door, FLOOR_THICKNESS, FLOOR_THICKNESS + DOOR_HEIGHT)
-        for f in d_faces:
-            all_faces.append({"vertices": f, "color": DOOR_PANEL_COLOR, "alpha": 1.0})
+        all_faces.add(_extrude_polygon_vertical_shell(door, FLOOR_THICKNESS, FLOOR_THICKNESS + DOOR_HEIGHT), DOOR_PANEL_COLOR)
 
     # 6. Render Mesh
     print(" Rendering Mesh...")
-    vertices = []
-    triangles = []
-    colors = []
-    
-    for item in all_faces:
-        face = item["vertices"]
-        if len(face) < 3: continue
-        base = len(vertices)
-        c = _hex_to_rgb01(item["color"])
-        for v in face:
-            vertices.append(v)
-            colors.append(c)
-        # Triangulation (fan)
-        for i in range(1, len(face) - 1):
-            triangles.append([base, base+i, base+i+1])
-            
-    if not vertices:
+    if not len(all_faces):
         return None
-        
+    vertices, triangles, colors = all_faces.arrays()
+
     mesh = o3d.geometry.TriangleMesh()
-    mesh.vertices = o3d.utility.Vector3dVector(np.array(vertices, dtype=float))
-    mesh.triangles = o3d.utility.Vector3iVector(np.array(triangles, dtype=np.int32))
-    mesh.vertex_colors = o3d.utility.Vector3dVector(np.array(colors, dtype=float))
+    mesh.vertices = o3d.utility.Vector3dVector(vertices)
+    mesh.triangles = o3d.utility.Vector3iVector(triangles)
+    mesh.vertex_colors = o3d.utility.Vector3dVector(colors)
     mesh.compute_vertex_normals()
     
     if output_file:
@@ -1,5 +1,6 @@
 import json
-import math
+from functools import lru_cache
+from math import sqrt
 
 # ==========================================================
 # LOAD LEARNED PRIORS
@@ -22,6 +23,7 @@ DEFAULT_RATIO = 1.3
 # ==========================================================
 # CORE SHAPE LOGIC
 # ==========================================================
+@lru_cache(maxsize=4096)
 def rectangle_from_area(area, aspect_ratio=DEFAULT_RATIO):
     """
     Given:
@@ -31,11 +33,22 @@ def rectangle_from_area(area, aspect_ratio=DEFAULT_RATIO):
     Returns:
         (width, height) respecting the area
     """
-    width = math.sqrt(area * aspect_ratio)
+    width = sqrt(area * aspect_ratio)
     height = area / width
     return width, height
 
 
+@lru_cache(maxsize=None)
+def _prior_for(room_type):
+    """(min_area, max_area, aspect_ratio) for a room type; None where unbounded."""
+    prior = PRIORS.get(room_type, {})
+    return (
+        prior.get("min_area"),
+        prior.get("max_area"),
+        prior.get("mean_aspect_ratio", DEFAULT_RATIO),
+    )
+
+
 def apply_priors(room_type, requested_area):
     """
     Applies learned priors (min/max area, aspect ratio)
@@ -44,17 +57,15 @@ def apply_priors(room_type, requested_area):
     Returns:
         (final_area, aspect_ratio)
     """
-    prior = PRIORS.get(room_type, {})
+    min_area, max_area, ratio = _prior_for(room_type)
 
     area = requested_area
 
     # Clamp area if bounds exist
-    if "min_area" in prior:
-        area = max(area, prior["min_area"])
-    if "max_area" in prior:
-        area = min(area, prior["max_area"])
-
-    ratio = prior.get("mean_aspect_ratio", DEFAULT_RATIO)
+    if min_area is not None:
+        area = max(area, min_area)
+    if max_area is not None:
+        area = min(area, max_area)
 
     return area, ratio
 
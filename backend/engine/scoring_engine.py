@@ -1,5 +1,101 @@
+import hashlib
 import math
-from layout_features import extract_layout_features
+from functools import lru_cache
+
+import numpy as np
+from numba import njit, prange
+
+from layout_features import FEATURE_NAMES, extract_layout_features
+
+# Column order of ScoringEngine.evaluate_batch
+SCORE_NAMES = ("efficiency", "privacy", "daylight", "circulation", "average")
+
+
+class _RoomsKey:
+    """
+    Cache key for a layout's rooms: hashes and compares by a digest of the
+    rooms' names and WKB. The rooms ride along only for the cache miss.
+    """
+    __slots__ = ("rooms", "_fingerprint", "_hash")
+
+    def __init__(self, rooms):
+        self.rooms = rooms
+        digest = hashlib.blake2b(digest_size=16)
+        for name, poly in rooms.items():
+            for part in (name.encode(), poly.wkb):
+                digest.update(len(part).to_bytes(8, "little"))
+                digest.update(part)
+        self._fingerprint = digest.digest()
+        self._hash = hash(self._fingerprint)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return isinstance(other, _RoomsKey) and self._fingerprint == other._fingerprint
+
+
+# Entries are a digest and a few floats; 256 covers the candidates of many
+# recent requests (each is scored again when the chosen one is saved)
+@lru_cache(maxsize=256)
+def _cached_features(rooms_key):
+    """extract_layout_features for a rooms fingerprint (features only use the rooms)."""
+    features = extract_layout_features({"rooms": rooms_key.rooms})
+    # The cache keeps this key object; it only needs the fingerprint
+    rooms_key.rooms = None
+    return features
+
+
+# Explicit signature: compiled once at import (and cached on disk), so the
+# first request never pays for compilation
+@njit("UniTuple(int32, 5)(float64, float64, float64, float64, float64)", cache=True)
+def _score_kernel(avg_dist, total_area, convex_hull_area, exterior_exposure, adj_pct):
+    """(efficiency, privacy, daylight, circulation, average) as ints."""
+    # Efficiency (Compactness Ratio)
+    # Ratio of Usable Area vs Convex Hull. 
+    # 100% = Perfectly rectangular/convex (no wasted voids).
+    # Lower score = Sprawling / irregular shape.
+    if convex_hull_area > 0:
+        efficiency = (total_area / convex_hull_area) * 100
+    else:
+        efficiency = 100.0 # Fallback
+        
+    # Privacy (Isolation)
+    # Higher avg distance = Higher Privacy
+    # Typical avg_dist ~ 3-8m.
+    # Map 3m -> 40, 8m -> 90.
+    privacy = min(100.0, avg_dist * 8)
+    
+    # Circulation (Ease of Movement)
+    # Lower avg distance = Better Circulation
+    # 3m -> 90, 8m -> 40.
+    # Relaxed penalty for better baseline scores
+    circulation = max(0.0, 100 - (avg_dist * 3.5))
+    
+    # Daylight (Perimeter Exposure)
+    # Higher perimeter = Better daylight potential.
+    # Typical perimeter 30-60m.
+    # 30m -> 50, 60m -> 100.
+    daylight = min(100.0, exterior_exposure * 1.2)
+
+    blended_average = (
+        efficiency * 0.28
+        + daylight * 0.28
+        + circulation * 0.19
+        + privacy * 0.15
+        + adj_pct * 0.10
+    )
+    return int(efficiency), int(privacy), int(daylight), int(circulation), int(blended_average)
+
+
+@njit(parallel=True, cache=True)
+def _score_batch(avg_dist, total_area, convex_hull_area, exterior_exposure, adj_pct, out):
+    """Fill row i of out ((N, 5) int32) with _score_kernel over the i-th inputs."""
+    for i in prange(avg_dist.shape[0]):
+        scores = _score_kernel(avg_dist[i], total_area[i], convex_hull_area[i], exterior_exposure[i], adj_pct[i])
+        for j in range(5):
+            out[i, j] = scores[j]
+
 
 class ScoringEngine:
     @staticmethod
@@ -21,13 +117,40 @@ class ScoringEngine:
             }
 
         # 1. Feature Extraction (Physics)
-        features = extract_layout_features(layout)
+        # Re-evaluating an identical layout reuses its features
+        features = _cached_features(_RoomsKey(rooms))
         
         # 2. Metric Computation
         scores = ScoringEngine._compute_scores(features, adjacency_satisfaction)
         
         return scores
 
+    @staticmethod
+    def evaluate_batch(features, adjacency_satisfaction=1.0):
+        """
+        Score many candidate layouts at once.
+        Input: (N, len(FEATURE_NAMES)) feature matrix (e.g. np.stack of
+               layout_features.features_to_array rows); adjacency_satisfaction
+               is a scalar or an (N,) array
+        Output: (N, len(SCORE_NAMES)) int32 matrix, columns as SCORE_NAMES
+        """
+        features = np.asarray(features, dtype=np.float64).reshape(-1, len(FEATURE_NAMES))
+        n = len(features)
+        columns = {name: np.ascontiguousarray(features[:, k]) for k, name in enumerate(FEATURE_NAMES)}
+        # int() per layout, as in evaluate
+        adj_pct = np.trunc(np.broadcast_to(np.asarray(adjacency_satisfaction, dtype=np.float64) * 100, (n,)))
+
+        out = np.empty((n, len(SCORE_NAMES)), dtype=np.int32)
+        _score_batch(
+            columns["avg_distance"],
+            columns["total_area"],
+            columns["convex_hull_area"],
+            columns["exterior_exposure"],
+            np.ascontiguousarray(adj_pct),
+            out,
+        )
+        return out
+
     @staticmethod
     def _compute_scores(features, adjacency_satisfaction: float = 1.0):
         """
@@ -61,50 +184,20 @@ class ScoringEngine:
         # If house is huge (mansion), Avg Dist ~20. 20*3 = 60. 100-60 = 40.
         # So smaller house = Higher Privacy Score? That makes sense if "Privacy" means "Cozi-ness".
         
-        avg_dist = features["avg_distance"]
-        
-        # Efficiency (Compactness Ratio)
-        # Ratio of Usable Area vs Convex Hull. 
-        # 100% = Perfectly rectangular/convex (no wasted voids).
-        # Lower score = Sprawling / irregular shape.
-        if features.get("convex_hull_area", 0) > 0:
-            efficiency = (features["total_area"] / features["convex_hull_area"]) * 100
-        else:
-            efficiency = 100 # Fallback
-            
-        # Privacy (Isolation)
-        # Higher avg distance = Higher Privacy
-        # Typical avg_dist ~ 3-8m.
-        # Map 3m -> 40, 8m -> 90.
-        privacy = min(100, avg_dist * 8)
-        
-        # Circulation (Ease of Movement)
-        # Lower avg distance = Better Circulation
-        # 3m -> 90, 8m -> 40.
-        # Relaxed penalty for better baseline scores
-        circulation = max(0, 100 - (avg_dist * 3.5))
-        
-        # Daylight (Perimeter Exposure)
-        # Higher perimeter = Better daylight potential.
-        # Typical perimeter 30-60m.
-        # 30m -> 50, 60m -> 100.
-        daylight = min(100, features["exterior_exposure"] * 1.2)
-        
         adj_pct = int(adjacency_satisfaction * 100)
-
-        blended_average = (
-            efficiency * 0.28
-            + daylight * 0.28
-            + circulation * 0.19
-            + privacy * 0.15
-            + adj_pct * 0.10
+        efficiency, privacy, daylight, circulation, average = _score_kernel(
+            float(features["avg_distance"]),
+            float(features["total_area"]),
+            float(features.get("convex_hull_area", 0)),
+            float(features["exterior_exposure"]),
+            float(adj_pct),
         )
 
         return {
-            "efficiency": int(efficiency),
-            "privacy": int(privacy),
-            "daylight": int(daylight),
-            "circulation": int(circulation),
+            "efficiency": efficiency,
+            "privacy": privacy,
+            "daylight": daylight,
+            "circulation": circulation,
             "adjacency_satisfaction_pct": adj_pct,
-            "average": int(blended_average)
+            "average": average
         }
@@ -1,15 +1,97 @@
 import re
 import json
 import logging
+from bisect import bisect_left
 from typing import List, Dict, Tuple, Optional, Set
 
+import numpy as np
+
 try:
     import requests as _requests
 except ImportError:
     _requests = None
 
+# pyahocorasick is optional: without it room mentions are found with one
+# regex sweep per room type
+try:
+    import ahocorasick as _ahocorasick
+except ImportError:
+    _ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# Fixed patterns, compiled once instead of on every prompt
+_UNIT_SUFFIX = r'(?:square\s+feet|sqft|sq\s+ft|sq\.?\s*ft|ft2|square\s+meters?|sqm|sq\s+m|m2|sq)'
+
+# Total area, priority 1: explicit total markers (e.g., "Total = 1500 sqft")
+_EXPLICIT_TOTAL_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    rf'total\s*(?:area)?\s*[=:]\s*(\d[\d,]*)\s*{_UNIT_SUFFIX}',
+    rf'total\s+area\s+(?:of\s+)?(\d[\d,]*)\s*{_UNIT_SUFFIX}',
+    rf'overall\s+(?:area\s+)?(?:of\s+)?(\d[\d,]*)\s*{_UNIT_SUFFIX}',
+    rf'(\d[\d,]*)\s*{_UNIT_SUFFIX}\s+(?:total|in\s+total|overall)',
+    rf'grand\s+total\s+(?:of\s+)?(\d[\d,]*)\s*{_UNIT_SUFFIX}',
+))
+# Total area, priority 2: legacy fallback (first bare unit occurrence)
+_LEGACY_TOTAL_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(\d[\d,]*)\s*(?:square\s+feet|sqft|sq\s+ft|sq\.?\s*ft|ft2)',
+    r'(\d[\d,]*)\s*(?:square\s+meters?|sqm|sq\s+m|m2)',
+    r'total.*?(\d+)\s*(?:square|sq)',
+    r'(\d+)\s*(?:square|sq).*?total',
+))
+_HOUSE_OF_RE = re.compile(r'house\s+of\s+(\d+)', re.IGNORECASE)
+_SQM_RE = re.compile(r'(?:sqm|m2|meters)', re.IGNORECASE)
+_SQFT_RE = re.compile(r'(?:sqft|ft2|feet)', re.IGNORECASE)
+
+_ROOM_SUFFIX_RE = re.compile(r'\s*room\b', re.IGNORECASE)
+_REFERENCE_RE = re.compile(r'(connected|attached|leads?|next)\s+to\s+(the\s+|a\s+|an\s+)?', re.IGNORECASE)
+_CONNECTION_RE = re.compile(r'(connected|attached|leads?|next)\s+to\s+(the\s+|a\s+|an\s+)?$', re.IGNORECASE)
+
+_AREA_UNIT_RE = re.compile(
+    r'(?:square\s+feet|sqft|sq\s+ft|sq\.?\s*ft|ft2|square\s+meters?|sqm|sq\s+m|m2)',
+    re.IGNORECASE
+)
+_NUMBER_RE = re.compile(r'(\d[\d,]*(?:\.\d+)?)')
+_DIGITS_RE = re.compile(r'\d+')
+_SOFT_CONNECTOR_RE = re.compile(
+    r'^(?:of|is|are|was|were|=|around|about|approximately|roughly|nearly)\b',
+    re.IGNORECASE
+)
+_MULTI_APPROX_RE = re.compile(
+    r'^(?:somewhere\s+around|at\s+least|at\s+most'
+    r'|no\s+less\s+than|no\s+more\s+than|not\s+less\s+than'
+    r'|not\s+more\s+than|around\s+about|in\s+the\s+range\s+of)',
+    re.IGNORECASE
+)
+_APPROX_WORD_RE = re.compile(r'\b(around|about|approximately|roughly|nearly)\b', re.IGNORECASE)
+_WITH_RE = re.compile(r'\bwith\b', re.IGNORECASE)
+_NEGATION_RE = re.compile(r'\b(no|without)\b')
+_EACH_RE = re.compile(r'\beach\b|\bevery\b', re.IGNORECASE)
+
+# Score given to (number, mention) pairs that may not be assigned
+_NO_CANDIDATE = np.iinfo(np.int64).max
+
+
+def _match_spans(pattern, text):
+    """(starts, ends) of pattern's non-overlapping matches in text, in order."""
+    spans = [m.span() for m in pattern.finditer(text)]
+    return [start for start, _ in spans], [end for _, end in spans]
+
+
+def _span_within(starts, ends, lo, hi):
+    """Whether one of the sorted, non-overlapping spans lies inside [lo, hi)."""
+    k = bisect_left(starts, lo)
+    return k < len(starts) and ends[k] <= hi
+
+
+def _is_soft_attribution(between: str) -> bool:
+    """Whether the text between a room and a later number attributes the number to it."""
+    # empty between = direct attribution (e.g. "bedroom 300 sqft")
+    if between == '' or _SOFT_CONNECTOR_RE.match(between) or _MULTI_APPROX_RE.match(between):
+        return True
+    # Also catch "around/about/approx" anywhere in a short between-string
+    # e.g. "should be the central space, around 550"
+    return len(between) <= 60 and bool(_APPROX_WORD_RE.search(between))
+
 class ProximityLayoutGenerator:
     def __init__(self):
         self.room_types = [
@@ -63,43 +145,52 @@ class ProximityLayoutGenerator:
             'meditation': 8, 'gym': 12, 'yoga': 10
         }
 
+        # One alternation per room type (longest synonym first, so e.g.
+        # 'living area' wins over 'living' at the same position)
+        self._mention_patterns = {
+            canonical: re.compile(
+                r'\b(' + '|'.join(map(re.escape, sorted(synonyms, key=len, reverse=True))) + r')s?\b',
+                re.IGNORECASE
+            )
+            for canonical, synonyms in self.synonym_map.items()
+        }
+        # All synonyms (and their plurals) in one automaton, so a prompt is
+        # scanned once for every room word
+        self._room_automaton = None
+        if _ahocorasick is not None:
+            self._room_automaton = _ahocorasick.Automaton()
+            for canonical, synonyms in self.synonym_map.items():
+                for syn in synonyms:
+                    for key in (syn, syn + 's'):
+                        self._room_automaton.add_word(key, (canonical, len(key)))
+            self._room_automaton.make_automaton()
+        self._qualifier_pattern = re.compile(
+            r'\b(' + '|'.join(map(re.escape, self.instance_qualifiers)) + r')\s+$'
+        )
+        # Per room word count patterns, built on first use
+        self._count_patterns = {}
+
         # Will hold metadata from the last parsed prompt
         self.last_metadata = None
         self.llm_adjacency = {"prefer": [], "avoid": []}
 
     def _extract_total_area(self, text: str) -> int:
         """Extract the total / overall house area from the prompt."""
-        UNIT_SUFFIX = r'(?:square\s+feet|sqft|sq\s+ft|sq\.?\s*ft|ft2|square\s+meters?|sqm|sq\s+m|m2|sq)'
-
         # Priority 1: explicit total markers (e.g., "Total = 1500 sqft")
-        explicit_patterns = [
-            rf'total\s*(?:area)?\s*[=:]\s*(\d[\d,]*)\s*{UNIT_SUFFIX}',
-            rf'total\s+area\s+(?:of\s+)?(\d[\d,]*)\s*{UNIT_SUFFIX}',
-            rf'overall\s+(?:area\s+)?(?:of\s+)?(\d[\d,]*)\s*{UNIT_SUFFIX}',
-            rf'(\d[\d,]*)\s*{UNIT_SUFFIX}\s+(?:total|in\s+total|overall)',
-            rf'grand\s+total\s+(?:of\s+)?(\d[\d,]*)\s*{UNIT_SUFFIX}',
-        ]
-
-        for pattern in explicit_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _EXPLICIT_TOTAL_PATTERNS:
+            match = pattern.search(text)
             if match:
                 raw = match.group(1).replace(',', '')
                 return int(raw)
 
         # Priority 2: legacy fallback (first bare unit occurrence)
-        legacy_patterns = [
-            r'(\d[\d,]*)\s*(?:square\s+feet|sqft|sq\s+ft|sq\.?\s*ft|ft2)',
-            r'(\d[\d,]*)\s*(?:square\s+meters?|sqm|sq\s+m|m2)',
-            r'total.*?(\d+)\s*(?:square|sq)',
-            r'(\d+)\s*(?:square|sq).*?total',
-        ]
-        for pattern in legacy_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
+        for pattern in _LEGACY_TOTAL_PATTERNS:
+            match = pattern.search(text)
             if match:
                 return int(match.group(1).replace(',', ''))
 
         # Priority 3: look for just a large number if explicitly requested "house of 900"
-        match = re.search(r'house\s+of\s+(\d+)', text, re.IGNORECASE)
+        match = _HOUSE_OF_RE.search(text)
         if match:
             return int(match.group(1))
 
@@ -107,9 +198,9 @@ class ProximityLayoutGenerator:
 
     def _detect_units(self, text: str) -> Optional[str]:
         """Detect if text implies sqft or sqm. Default to sqft if ambiguous high numbers."""
-        if re.search(r'(?:sqm|m2|meters)', text, re.IGNORECASE):
+        if _SQM_RE.search(text):
             return 'sqm'
-        if re.search(r'(?:sqft|ft2|feet)', text, re.IGNORECASE):
+        if _SQFT_RE.search(text):
             return 'sqft'
         return None
 
@@ -122,30 +213,24 @@ class ProximityLayoutGenerator:
         Rule 22: extend span when "room" follows the synonym word.
         """
         mentions = []
-        for canonical, synonyms in self.synonym_map.items():
-            for word in synonyms:
-                for match in re.finditer(rf'\b({re.escape(word)})s?\b', text, re.IGNORECASE):
-                    # Rule 22: extend end to include "room" if it follows
-                    end_pos = match.end()
-                    tail = text[end_pos: end_pos + 6]
-                    if re.match(r'\s*room\b', tail, re.IGNORECASE):
-                        end_pos += re.match(r'\s*room\b', tail, re.IGNORECASE).end()
-
-                    # Rule 18: check for qualifier immediately before this mention
-                    pre = text[max(0, match.start() - 20): match.start()].lower().strip()
-                    qualifier = None
-                    for q in self.instance_qualifiers:
-                        if re.search(rf'\b{re.escape(q)}\s+$', pre):
-                            qualifier = q
-                            break
-
-                    mentions.append({
-                        'start': match.start(),
-                        'end':   end_pos,
-                        'word':  text[match.start(): end_pos].lower(),
-                        'type':  canonical,
-                        'qualifier': qualifier,
-                    })
+        for canonical, start, end_pos in self._scan_room_words(text):
+            # Rule 22: extend end to include "room" if it follows
+            room_match = _ROOM_SUFFIX_RE.match(text, end_pos, end_pos + 6)
+            if room_match:
+                end_pos = room_match.end()
+
+            # Rule 18: check for qualifier immediately before this mention
+            pre = text[max(0, start - 20): start].lower().strip()
+            q_match = self._qualifier_pattern.search(pre)
+            qualifier = q_match.group(1) if q_match else None
+
+            mentions.append({
+                'start': start,
+                'end':   end_pos,
+                'word':  text[start: end_pos].lower(),
+                'type':  canonical,
+                'qualifier': qualifier,
+            })
 
         mentions.sort(key=lambda x: x['start'])
 
@@ -182,15 +267,11 @@ class ProximityLayoutGenerator:
         # Reference filter — only filter if this room type was already seen
         # e.g. "living room connected to the dining room" → dining FIRST occurrence, keep it
         # but "...and a second kitchen" after kitchen was mentioned → filter the reference
-        conn_re = re.compile(
-            r'(connected|attached|leads?|next)\s+to\s+(the\s+|a\s+|an\s+)?',
-            re.IGNORECASE
-        )
         final_mentions = []
         seen_types: Set[str] = set()
         for m in unique_mentions:
             ctx_before = text[max(0, m['start'] - 50): m['start']]
-            is_ref = bool(conn_re.search(ctx_before))
+            is_ref = bool(_REFERENCE_RE.search(ctx_before))
             # Only skip if it's a reference AND we already have this room type
             if is_ref and m['type'] in seen_types:
                 continue
@@ -199,6 +280,42 @@ class ProximityLayoutGenerator:
 
         return final_mentions
 
+    def _scan_room_words(self, text: str) -> List[Tuple[str, int, int]]:
+        """
+        Whole-word synonym matches as (canonical, start, end), grouped by
+        room type in synonym_map order and by position within a type.
+
+        Within a type, overlapping matches resolve as the per-type regex
+        does: leftmost first, then longest.
+        """
+        lowered = text.lower()
+        if self._room_automaton is None or len(lowered) != len(text):
+            return [
+                (canonical, match.start(), match.end())
+                for canonical, pattern in self._mention_patterns.items()
+                for match in pattern.finditer(text)
+            ]
+
+        n = len(lowered)
+        hits = {canonical: [] for canonical in self.synonym_map}
+        for last, (canonical, length) in self._room_automaton.iter(lowered):
+            start, end = last - length + 1, last + 1
+            # Word boundaries on both sides (same notion of word char as \b)
+            if start > 0 and (lowered[start - 1].isalnum() or lowered[start - 1] == '_'):
+                continue
+            if end < n and (lowered[end].isalnum() or lowered[end] == '_'):
+                continue
+            hits[canonical].append((start, end))
+
+        spans = []
+        for canonical, found in hits.items():
+            last_end = -1
+            for start, end in sorted(found, key=lambda se: (se[0], -se[1])):
+                if start >= last_end:
+                    spans.append((canonical, start, end))
+                    last_end = end
+        return spans
+
     def _get_local_context(self, text, pos, window=30):
         """Get substring around a position."""
         start = max(0, pos - window)
@@ -207,21 +324,35 @@ class ProximityLayoutGenerator:
 
     def _parse_count(self, context, room_word):
         """Parse count from local context. e.g. '3 bedrooms', 'two baths'"""
-        # Improved regex to handle '3x', '3 ', etc.
-        digit_match = re.search(rf'(\d+)\s*(?:x|nos?\.?\s+)?{re.escape(room_word)}', context, re.IGNORECASE)
+        digit_re, word_res = self._get_count_patterns(room_word)
+        digit_match = digit_re.search(context)
         if digit_match:
             return int(digit_match.group(1))
         
         # Check word: "two bedrooms"
-        for word, num in self.word_to_num.items():
-            if re.search(rf'\b{word}\s+(?:x|nos?\.?\s+)?{re.escape(room_word)}', context, re.IGNORECASE):
+        for word_re, num in word_res:
+            if word_re.search(context):
                 return num
         return 1
 
+    def _get_count_patterns(self, room_word):
+        """(digit pattern, [(number-word pattern, value), ...]) for room_word, compiled once."""
+        patterns = self._count_patterns.get(room_word)
+        if patterns is None:
+            word = re.escape(room_word)
+            # Improved regex to handle '3x', '3 ', etc.
+            digit_re = re.compile(rf'(\d+)\s*(?:x|nos?\.?\s+)?{word}', re.IGNORECASE)
+            word_res = [
+                (re.compile(rf'\b{num_word}\s+(?:x|nos?\.?\s+)?{word}', re.IGNORECASE), num)
+                for num_word, num in self.word_to_num.items()
+            ]
+            patterns = self._count_patterns[room_word] = (digit_re, word_res)
+        return patterns
+
     def _parse_areas(self, context, context_offset, total_area, room_pos):
         """Extract areas near room_pos, excluding total_area."""
         areas = []
-        for match in re.finditer(r'\d+', context):
+        for match in _DIGITS_RE.finditer(context):
             val = int(match.group())
             if val < 5 or val == total_area: # Lower threshold for sqm
                 continue
@@ -334,95 +465,77 @@ class ProximityLayoutGenerator:
         combined_rooms = self._extract_combined_rooms(original_text, total_area, scale_factor)
         combined_types: Set[str] = {r['type'] for r in combined_rooms}
 
-        # --- GLOBAL NUMBER ASSIGNMENT (Rules 6,13,15,19,20,22,23) ---
-        UNIT_RE = re.compile(
-            r'(?:square\s+feet|sqft|sq\s+ft|sq\.?\s*ft|ft2|square\s+meters?|sqm|sq\s+m|m2)',
-            re.IGNORECASE
-        )
-        MULTI_APPROX = [
-            r'somewhere\s+around', r'at\s+least', r'at\s+most',
-            r'no\s+less\s+than', r'no\s+more\s+than', r'not\s+less\s+than',
-            r'not\s+more\s+than', r'around\s+about', r'in\s+the\s+range\s+of',
+        # Phrases checked just before each mention, found with one scan of
+        # the prompt each instead of slicing and searching a window per mention
+        conn_start_by_end = {m.end(): m.start() for m in _REFERENCE_RE.finditer(original_text)}
+        neg_starts, neg_ends = _match_spans(_NEGATION_RE, original_text)
+        with_starts, with_ends = _match_spans(_WITH_RE, original_text)
+        # "connected to the" ending right at the mention, within 30 chars
+        after_connection = [
+            m['start'] in conn_start_by_end and conn_start_by_end[m['start']] >= m['start'] - 30
+            for m in mentions
         ]
+        negated = [_span_within(neg_starts, neg_ends, m['start'] - 15, m['start']) for m in mentions]
+        after_with = [_span_within(with_starts, with_ends, m['start'] - 25, m['start']) for m in mentions]
 
+        # --- GLOBAL NUMBER ASSIGNMENT (Rules 6,13,15,19,20,22,23) ---
         number_assignments = {i: [] for i in range(len(mentions))}
-        connection_pattern = re.compile(r'(connected|attached|leads?|next)\s+to\s+(the\s+|a\s+|an\s+)?$', re.IGNORECASE)
 
         # Build number entries — only unit-bearing numbers qualify as room areas
         number_entries = []
-        for match in re.finditer(r'(\d[\d,]*(?:\.\d+)?)', original_text):
+        for match in _NUMBER_RE.finditer(original_text):
             raw_val = float(match.group(1).replace(',', ''))
             pos     = match.start()
             after   = original_text[pos: pos + len(match.group(1)) + 15]
-            has_unit = bool(UNIT_RE.search(after))
+            unit_match = _AREA_UNIT_RE.search(after)
             # Rule 15: ≤9 without unit = count; Rule 19: >9 without unit = skip
-            if not has_unit:
+            if not unit_match:
                 continue
             # Skip total area value
             if int(raw_val) == raw_total_area:
                 continue
             # Convert to raw value (scale applied per room below)
-            unit_match = UNIT_RE.search(after)
-            unit_str   = unit_match.group(0).lower() if unit_match else ''
+            unit_str   = unit_match.group(0).lower()
             is_sqft    = any(x in unit_str for x in ['sqft', 'feet', 'ft', 'ft2'])
             val_sqm    = raw_val * 0.092903 if is_sqft else raw_val
             number_entries.append({'pos': pos, 'raw': raw_val, 'val_sqm': val_sqm, 'claimed': False})
 
-        for entry in number_entries:
-            pos = entry['pos']
-            candidates = []
-            for i, m in enumerate(mentions):
-                if pos < m['start']:
-                    dist = m['start'] - pos
-                elif pos > m['end']:
-                    dist = pos - m['end']
-                else:
-                    dist = 0
-                is_before = pos < m['start']
-                pre_text  = original_text[max(0, m['start'] - 30): m['start']]
-                is_ref    = bool(connection_pattern.search(pre_text))
-
-                # Rule 6+23: numbers before rooms are usually counts, not areas
-                # Apply penalty unless very close (≤10 chars) — "550sqft living room"
-                if is_before:
-                    penalty = 0 if dist <= 10 else 15
-                else:
-                    between = original_text[m['end']: pos].strip()
-                    # empty between = direct attribution (e.g. "bedroom 300 sqft")
-                    soft = (between == '') or bool(re.match(
-                        r'^(?:of|is|are|was|were|=|around|about|approximately|roughly|nearly)\b',
-                        between, re.IGNORECASE
-                    ))
-                    if not soft:
-                        for approx in MULTI_APPROX:
-                            if re.search(rf'^{approx}', between, re.IGNORECASE):
-                                soft = True
-                                break
-                    # Also catch "around/about/approx" anywhere in a short between-string
-                    # e.g. "should be the central space, around 550"
-                    if not soft and len(between) <= 60:
-                        if re.search(r'\b(around|about|approximately|roughly|nearly)\b', between, re.IGNORECASE):
-                            soft = True
-                    # soft connector = direct attribution — use negative bonus so this room wins
-                    penalty = -10 if soft else 20
-
-                # Rule 25: skip storage mentions preceded by "with" (embedded qualifiers)
-                pre_25 = original_text[max(0, m['start'] - 25): m['start']]
-                if m['type'] == 'storage' and re.search(r'\bwith\b', pre_25, re.IGNORECASE):
-                    continue
-
-                if dist < 60:
-                    candidates.append((dist + penalty, i, is_ref, is_before))
-
-            candidates.sort(key=lambda x: x[0])
-            for _, idx, is_ref, is_before in candidates:
-                if is_ref and is_before:
-                    continue
+        if number_entries:
+            # (numbers, mentions) grids of distances and flags, so every
+            # number picks its mention with a single argmin
+            pos = np.array([e['pos'] for e in number_entries])[:, None]
+            starts = np.array([m['start'] for m in mentions])[None, :]
+            ends = np.array([m['end'] for m in mentions])[None, :]
+            pre_is_ref = np.array(after_connection)
+            # Rule 25: skip storage mentions preceded by "with" (embedded qualifiers)
+            embedded = np.array([
+                m['type'] == 'storage' and with_before
+                for m, with_before in zip(mentions, after_with)
+            ])
+
+            is_before = pos < starts
+            dist = np.where(is_before, starts - pos, np.maximum(pos - ends, 0))
+            # A number before a reference ("next to the kitchen") never belongs to it
+            allowed = (dist < 60) & ~embedded & ~(is_before & pre_is_ref)
+
+            # Rule 6+23: numbers before rooms are usually counts, not areas
+            # Apply penalty unless very close (≤10 chars) — "550sqft living room"
+            penalty = np.where(dist <= 10, 0, 15)
+            # Numbers after a room: a soft connector is direct attribution, so
+            # use a negative bonus to make this room win
+            for r, c in np.argwhere(allowed & ~is_before).tolist():
+                between = original_text[mentions[c]['end']: number_entries[r]['pos']].strip()
+                penalty[r, c] = -10 if _is_soft_attribution(between) else 20
+
+            # Lowest score wins, ties to the earliest mention
+            score = np.where(allowed, dist + penalty, _NO_CANDIDATE)
+            best = score.argmin(axis=1)
+            for r in np.flatnonzero(allowed.any(axis=1)).tolist():
+                entry = number_entries[r]
                 # Rule 13: first claim wins
                 if not entry['claimed']:
-                    number_assignments[idx].append(entry['val_sqm'])
+                    number_assignments[int(best[r])].append(entry['val_sqm'])
                     entry['claimed'] = True
-                break
 
         explicit_rooms = []
         excluded_types = set()
@@ -448,24 +561,21 @@ class ProximityLayoutGenerator:
             # --- CONDITIONAL REFERENCE FILTER ---
             # Only skip if it's a reference AND this room type already exists
             # e.g. "living room connected to the dining" → first dining occurrence → keep
-            pre_context = original_text[max(0, room_pos - 30):room_pos].lower()
             areas = number_assignments[idx]
             already_have_type = any(r['type'] == room_type for r in explicit_rooms)
             
-            if connection_pattern.search(pre_context) and not areas and already_have_type:
+            if after_connection[idx] and not areas and already_have_type:
                 continue
             # ------------------------------------
 
             # --- NEGATION CHECK ---
-            pre_short = original_text[max(0, room_pos - 15):room_pos].lower()
-            if re.search(r'\b(no|without)\b', pre_short):
+            if negated[idx]:
                 excluded_types.add(room_type)
                 continue
 
             # Rule 25: skip embedded storage/closet mentions preceded by "with" with no area
-            pre_25 = original_text[max(0, room_pos - 25): room_pos]
             areas = number_assignments[idx]
-            if room_type == 'storage' and re.search(r'\bwith\b', pre_25, re.IGNORECASE) and not areas:
+            if room_type == 'storage' and after_with[idx] and not areas:
                 continue
             
             # Parse count — use canonical type word (e.g. 'bedroom') not compound match
@@ -476,11 +586,7 @@ class ProximityLayoutGenerator:
             
             if areas:
                 # Rule 16: "each"/"every" → replicate first area to all count instances
-                each_match = re.search(
-                    r'\beach\b|\bevery\b',
-                    original_text[room_pos: min(len(original_text), room_pos + 60)],
-                    re.IGNORECASE
-                )
+                each_match = _EACH_RE.search(original_text, room_pos, room_pos + 60)
                 if each_match and count > 1:
                     shared_area = round(areas[0], 2)
                     # Rule 14: discard if >= total
@@ -894,17 +1000,19 @@ class ProximityLayoutGenerator:
                 
                 type_counts = {}
                 for r in auto_rooms: type_counts[r['type']] = type_counts.get(r['type'], 0) + 1
-                
-                total_pct = 0
-                for r in auto_rooms:
-                    base = DEFAULTS.get(r['type'], 0.1) * (1.5 if r['type'] in amplified else 1.0)
-                    total_pct += base / type_counts[r['type']]
+
+                # Each room's share of its type's default ratio, once per type
+                per_type_ratio = {
+                    t: DEFAULTS.get(t, 0.1) * (1.5 if t in amplified else 1.0) / c
+                    for t, c in type_counts.items()
+                }
+                total_pct = sum(per_type_ratio[r['type']] for r in auto_rooms)
                 
                 if total_pct == 0: total_pct = 1
+                max_allowed = total_area * 0.35
                 for r in auto_rooms:
-                    r_ratio = (DEFAULTS.get(r['type'], 0.1) * (1.5 if r['type'] in amplified else 1.0)) / type_counts[r['type']]
-                    share = (r_ratio / total_pct) * remaining_area
-                    r['area'] = max(self.min_areas.get(r['type'], 5), int(min(share, total_area * 0.35)))
+                    share = (per_type_ratio[r['type']] / total_pct) * remaining_area
+                    r['area'] = max(self.min_areas.get(r['type'], 5), int(min(share, max_allowed)))
 
         # E. Final Scaling to target (proportional)
         current_total = sum(r.get('area', 0) for r in room_list)
@@ -12,9 +12,17 @@ if os.name == "nt":
 
 _LAZY_MODEL = None
 
-def transcribe_audio(file_path: str, model=None) -> str:
+
+def load_model(name: str = "tiny.en"):
+    """Load the Whisper model used for transcription (faster-whisper, int8 weights on CPU)."""
+    from faster_whisper import WhisperModel
+    return WhisperModel(name, device="cpu", compute_type="int8")
+
+
+def transcribe_audio(file_path, model=None) -> str:
     """
-    Transcribes an audio file to text using Whisper tiny.en model.
+    Transcribes an audio file (path or file-like object) to text using the
+    Whisper tiny.en model.
     Accepts a pre-loaded model for performance. Falls back to lazy-loading on first use.
     Returns transcribed text string, or empty string on failure.
     """
@@ -22,15 +30,17 @@ def transcribe_audio(file_path: str, model=None) -> str:
     try:
         if model is None:
             if _LAZY_MODEL is None:
-                import whisper
                 logger.warning("[VOICE] ⚠️  Whisper model not pre-loaded — lazy loading now. First request will be slow.")
                 print("[VOICE] ⚠️  Whisper model not pre-loaded — lazy loading now. First request will be slow.")
-                _LAZY_MODEL = whisper.load_model("tiny.en")
+                _LAZY_MODEL = load_model("tiny.en")
             model = _LAZY_MODEL
 
-        print(f"[VOICE] 🎙️  Starting transcription for file: {file_path}")
-        result = model.transcribe(file_path, fp16=False, language='en')
-        text = result['text'].strip()
+        source = file_path if isinstance(file_path, (str, os.PathLike)) else "<in-memory audio>"
+        print(f"[VOICE] 🎙️  Starting transcription for file: {source}")
+        # Greedy decoding; the VAD filter drops leading/trailing silence
+        # before it reaches the decoder
+        segments, _info = model.transcribe(file_path, language='en', beam_size=1, vad_filter=True)
+        text = "".join(segment.text for segment in segments).strip()
 
         if not text:
             print("[VOICE] ⚠️  Transcription returned empty — no speech detected in audio.")
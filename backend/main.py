@@ -6,17 +6,9 @@ _BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
 if _BACKEND_DIR not in sys.path:
     sys.path.insert(0, _BACKEND_DIR)
 
-# Heavy ML imports (torch, etc.) are deferred to prevent Render deployment timeouts.
-# On Windows, we may still need a top-level torch import for some DLL initialization, 
-# but for Render (Linux), doing it top-level causes 'Port scan timeout'.
-if sys.platform == "win32":
-    try:
-        import torch
-    except ImportError:
-        pass
-
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from routes import api, user
 from database.connection import connect_to_mongo, close_mongo_connection, create_database_indexes
 import database.connection
@@ -101,6 +93,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress layout JSON and the /static meshes for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 app.include_router(api.router, prefix="/api/v1")
 app.include_router(user.router, prefix="/api/v1")
 
@@ -118,4 +113,9 @@ def health_check():
     return {"status": "healthy", "service": "vox-assist-backend"}
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # DEV=1 for auto-reload (single process); otherwise one worker per core
+    # unless WEB_CONCURRENCY says otherwise. uvicorn's default "auto" loop
+    # and http pick uvloop and httptools when they are installed.
+    dev = bool(os.getenv("DEV"))
+    workers = None if dev else int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=dev, workers=workers)
\ No newline at end of file
@@ -3,7 +3,7 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime
 from bson import ObjectId
 from enum import Enum
-from config import settings
+from config import get_settings
 
 class PyObjectId(ObjectId):
     @classmethod
@@ -40,7 +40,7 @@ class DesignBase(BaseModel):
     }
 
 class DesignCreate(BaseModel):
-    prompt: str = Field(..., min_length=1, max_length=settings.MAX_PROMPT_LENGTH, description="Design prompt (max 5000 characters)")
+    prompt: str = Field(..., min_length=1, max_length=get_settings().MAX_PROMPT_LENGTH, description="Design prompt (max 5000 characters)")
 
 class DesignResponse(DesignBase):
     id: str = Field(alias="_id")
@@ -9,8 +9,7 @@ from typing import List, Optional
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Request, UploadFile, File
 import logging
 from pydantic import BaseModel
-import tempfile
-import os
+import io
 
 logger = logging.getLogger(__name__)
 
@@ -478,23 +477,19 @@ async def voice_transcribe(
     else:
         print("[VOICE-ROUTE] ✅  Whisper model found in app state. Using pre-loaded model.")
 
-    # Save uploaded audio to a temp file
-    tmp_path = None
+    from engine.voice_text import transcribe_audio
+
+    # faster-whisper decodes the upload straight from memory
     try:
-        with tempfile.NamedTemporaryFile(suffix=".webm", delete=False) as tmp:
-            contents = await audio.read()
-            tmp.write(contents)
-            tmp_path = tmp.name
-        print(f"[VOICE-ROUTE] 💾  Audio saved to temp file: {tmp_path}")
+        audio_source = io.BytesIO(await audio.read())
 
     except Exception as e:
-        print(f"[VOICE-ROUTE] ❌  ERROR — Failed to save audio to temp file: {str(e)}")
+        print(f"[VOICE-ROUTE] ❌  ERROR — Failed to read the uploaded audio: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to process audio file.")
 
     # Transcribe
     try:
-        from engine.voice_text import transcribe_audio
-        text = transcribe_audio(tmp_path, model=whisper_model)
+        text = transcribe_audio(audio_source, model=whisper_model)
 
         if not text:
             print("[VOICE-ROUTE] ⚠️  Transcription returned empty — sending empty response to frontend.")
@@ -505,10 +500,4 @@ async def voice_transcribe(
 
     except Exception as e:
         print(f"[VOICE-ROUTE] ❌  ERROR — Transcription step failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
-
-    finally:
-        # Always clean up temp file
-        if tmp_path and os.path.exists(tmp_path):
-            os.remove(tmp_path)
-            print(f"[VOICE-ROUTE] 🧹  Temp file cleaned up: {tmp_path}")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Transcription failed: {str(e)}")
\ No newline at end of file
@@ -135,7 +135,7 @@ class GenerationService:
                         None, 
                         synthesize_layout_from_spec, 
                         spec, 
-                        {"RANDOM_SEED": seed, "adjacency_pairs": merged_pairs}
+                        {"RANDOM_SEED": seed, "adjacency_pairs": merged_pairs, "VERBOSE": False}
                     )
 
                     if not layout_candidate.get("rooms"):
@@ -0,0 +1,29 @@
+import os
+import sys
+
+import pytest
+
+# Engine modules import each other flat (e.g. `from layout_features import ...`)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "engine"))
+
+LAYOUT_SPECS = [
+    {"rooms": [{"type": "living", "area": 30}, {"type": "kitchen", "area": 12}, {"type": "bedroom", "area": 14},
+               {"type": "bedroom", "area": 12}, {"type": "bathroom", "area": 5}, {"type": "balcony", "area": 6}]},
+    {"rooms": [{"type": "living", "area": 25}, {"type": "dining", "area": 12}, {"type": "kitchen", "area": 10},
+               {"type": "bedroom", "area": 13}, {"type": "study", "area": 9}, {"type": "bathroom", "area": 5},
+               {"type": "storage", "area": 3}, {"type": "hallway", "area": 8}]},
+    {"rooms": [{"type": "living", "area": 18}, {"type": "bedroom", "area": 10}]},
+]
+LAYOUT_SEEDS = range(4)
+
+
+@pytest.fixture(scope="session")
+def layouts():
+    """Synthesized layouts for every LAYOUT_SPECS entry and seed, built once per run."""
+    from layout_synthesizer_adjacency import synthesize_layout_from_spec
+
+    return [
+        synthesize_layout_from_spec(spec, {"RANDOM_SEED": seed, "VERBOSE": False})
+        for spec in LAYOUT_SPECS
+        for seed in LAYOUT_SEEDS
+    ]
@@ -0,0 +1,20 @@
+import shapely
+from shapely.geometry import Point, Polygon
+
+from Extraction import _to_wkt_frame
+
+
+def test_geometry_round_trips_at_full_precision():
+    poly = Polygon([(0.123456789012, 1.000000000001), (10.987654321098, 0.5), (3.14159265358979, 7.25)])
+    frame = _to_wkt_frame([{"id": 1, "poly": poly}], ["id", "poly"])
+
+    wkt = frame["poly"][0]
+    assert wkt == poly.wkt
+    assert shapely.from_wkt(wkt).equals_exact(poly, 0)
+
+
+def test_non_geometry_cells_in_geometry_column():
+    rows = [{"geom": Point(1, 2)}, {"geom": []}, {"geom": None}]
+    frame = _to_wkt_frame(rows, ["geom"])
+
+    assert frame["geom"].tolist() == [Point(1, 2).wkt, "[]", None]
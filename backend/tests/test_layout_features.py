@@ -0,0 +1,23 @@
+import numpy as np
+import pytest
+
+import layout_features
+from layout_features import (FEATURE_NAMES, extract_layout_features, extract_layout_features_batch,
+                             features_to_array)
+
+
+@pytest.mark.parametrize("parallel", [False, True])
+def test_batch_matches_single(layouts, parallel, monkeypatch):
+    layouts = layouts + [{"rooms": {}}]
+    if parallel:
+        # Force the process pool path even for a small batch
+        monkeypatch.setattr(layout_features, "MIN_PARALLEL_LAYOUTS", 1)
+    batch = extract_layout_features_batch(layouts, max_workers=2 if parallel else 1)
+    assert batch == [extract_layout_features(layout) for layout in layouts]
+
+
+def test_features_to_array_order(layouts):
+    features = extract_layout_features(layouts[0])
+    array = features_to_array(features)
+    assert array.dtype == np.float32
+    assert array.tolist() == pytest.approx([features[name] for name in FEATURE_NAMES])
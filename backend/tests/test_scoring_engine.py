@@ -0,0 +1,35 @@
+import numpy as np
+
+from layout_features import FEATURE_NAMES, extract_layout_features
+from scoring_engine import SCORE_NAMES, ScoringEngine
+
+
+def _feature_matrix(layouts):
+    return np.array([[extract_layout_features(layout)[name] for name in FEATURE_NAMES] for layout in layouts])
+
+
+def test_evaluate_batch_matches_evaluate(layouts):
+    adjacency = np.linspace(0.0, 1.0, len(layouts))
+    scores = ScoringEngine.evaluate_batch(_feature_matrix(layouts), adjacency)
+
+    assert scores.shape == (len(layouts), len(SCORE_NAMES))
+    assert scores.dtype == np.int32
+    for layout, adj, row in zip(layouts, adjacency, scores):
+        expected = ScoringEngine.evaluate(layout, adj)
+        assert row.tolist() == [expected[name] for name in SCORE_NAMES]
+
+
+def test_evaluate_batch_scalar_adjacency(layouts):
+    features = _feature_matrix(layouts)
+    scalar = ScoringEngine.evaluate_batch(features, 0.6)
+    broadcast = ScoringEngine.evaluate_batch(features, np.full(len(layouts), 0.6))
+    single = ScoringEngine.evaluate_batch(features[0], 0.6)
+
+    assert np.array_equal(scalar, broadcast)
+    assert np.array_equal(single, scalar[:1])
+
+
+def test_evaluate_empty_layout():
+    scores = ScoringEngine.evaluate({"rooms": {}}, 0.5)
+    assert scores["average"] == 0
+    assert scores["adjacency_satisfaction_pct"] == 50
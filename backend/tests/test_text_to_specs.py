@@ -0,0 +1,98 @@
+import pytest
+
+from text_to_specs_v2 import ProximityLayoutGenerator
+
+# (prompt, total_area sqm, [(room name, area sqm)], excluded types)
+PINNED_PROMPTS = [
+    (
+        "I want a 1500 sqft house with a large living room (400 sqft), a small kitchen (100 sqft), "
+        "and two bedrooms. The kitchen should be next to the dining area. "
+        "The bedrooms should be far from the living room.",
+        139,
+        [("living", 37.16), ("kitchen", 9.29), ("bedroom_1", 0), ("bedroom_2", 0), ("dining", 0)],
+        set(),
+    ),
+    (
+        "Design a 3BHK flat of 1200 sqft. Master bedroom adjacent to bathroom. Kitchen near balcony.",
+        111,
+        [("bedroom", 0), ("bathroom", 0), ("kitchen", 0), ("balcony", 0)],
+        set(),
+    ),
+    (
+        "Design a 1200 sqft house with 3 bedrooms, 2 bathrooms, a modular kitchen, and a small balcony",
+        111,
+        [("bedroom_1", 0), ("bedroom_2", 0), ("bedroom_3", 0), ("bathroom_1", 0), ("bathroom_2", 0),
+         ("kitchen", 0), ("balcony", 0)],
+        set(),
+    ),
+    (
+        "A 1800 sqft home: living room of 400 sqft connected to the dining room, kitchen 150 sqft, "
+        "master bedroom 250 sqft with attached bathroom 60 sqft, guest bedroom 200 sqft, no balcony.",
+        167,
+        [("living", 37.16), ("dining", 0), ("kitchen", 13.94), ("bedroom_1", 23.23), ("bathroom", 5.57),
+         ("bedroom_2", 18.58)],
+        {"balcony"},
+    ),
+    (
+        "150 sqm apartment with 2 bedrooms each 14 sqm, one bathroom, living area around 40 sqm, "
+        "storage with closet",
+        150,
+        [("bedroom_1", 14.0), ("bedroom_2", 14.0), ("bathroom", 0), ("living", 40.0), ("storage", 0)],
+        set(),
+    ),
+    (
+        "3 bedrooms, 2 bathrooms, gym 20 sqm, yoga studio, meditation room, parking garage, "
+        "total area 200 sqm",
+        200,
+        [("bedroom_1", 0), ("bedroom_2", 0), ("bedroom_3", 0), ("bathroom_1", 0), ("bathroom_2", 0),
+         ("gym", 20.0), ("yoga", 0), ("meditation", 0), ("parking", 0)],
+        set(),
+    ),
+]
+
+# Extra prompts for the automaton/regex comparison: casing, plurals,
+# overlapping synonyms, words glued to punctuation or other words
+SCAN_PROMPTS = [prompt for prompt, *_ in PINNED_PROMPTS] + [
+    "Living Room 30 Sqm, Two Bedrooms, No Balcony. Total 120 Sqm House",
+    "bedroom bedroom bedroom kitchen kitchen toilet restroom washroom",
+    "Total = 1500 sqft. Hallway – 200 sqft; Dining – 200 sqft; Kitchen – 200 sqft; "
+    "Bedroom 1 - 300 sqft; Bedroom 2 - 250 sqft; Living - 350 sqft",
+    "a bed-room, a bathroom/toilet, living area and dining area, the bedrooms' closets, bathtub, "
+    "sofabed in the sunbath lounge_area",
+    "master bedroom, guest bedroom, kids bedroom, 2 baths, family lounge, breakfast nook, pantry",
+    "İstanbul flat: living room, kitchen and bedroom",
+]
+
+
+@pytest.fixture(scope="module")
+def generator():
+    return ProximityLayoutGenerator()
+
+
+@pytest.fixture(scope="module")
+def regex_generator():
+    gen = ProximityLayoutGenerator()
+    gen._room_automaton = None
+    return gen
+
+
+def _summary(parsed):
+    total_area, rooms, _used_area, excluded = parsed
+    return total_area, [(r["name"], round(r["area"], 2)) for r in rooms], excluded
+
+
+@pytest.mark.parametrize("prompt,total_area,rooms,excluded", PINNED_PROMPTS)
+def test_parse_natural_language_pinned(generator, regex_generator, prompt, total_area, rooms, excluded):
+    expected = (total_area, rooms, excluded)
+    assert _summary(generator.parse_natural_language(prompt)) == expected
+    assert _summary(regex_generator.parse_natural_language(prompt)) == expected
+
+
+@pytest.mark.parametrize("prompt", SCAN_PROMPTS)
+def test_room_automaton_matches_regex_scan(generator, regex_generator, prompt):
+    if generator._room_automaton is None:
+        pytest.skip("pyahocorasick is not installed")
+    for text in (prompt, prompt.lower()):
+        assert generator._scan_room_words(text) == regex_generator._scan_room_words(text)
+    assert generator._find_room_mentions(prompt.lower()) == regex_generator._find_room_mentions(prompt.lower())
+    assert generator.parse_natural_language(prompt) == regex_generator.parse_natural_language(prompt)
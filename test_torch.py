@@ -2,15 +2,15 @@ import sys
 print(f"Python: {sys.executable}")
 
 try:
-    import torch
-    print(f"Torch version: {torch.__version__}")
-    print("Torch OK")
+    import ctranslate2
+    print(f"CTranslate2 version: {ctranslate2.__version__}")
+    print("CTranslate2 OK")
 except Exception as e:
-    print(f"Torch FAILED: {e}")
+    print(f"CTranslate2 FAILED: {e}")
 
 try:
-    import whisper
-    m = whisper.load_model("base.en")
+    from faster_whisper import WhisperModel
+    m = WhisperModel("base.en", device="cpu", compute_type="int8")
     print("Whisper OK")
 except Exception as e:
     print(f"Whisper FAILED: {e}")
\ No newline at end of file